@@ -1,24 +1,66 @@
 #!/usr/bin/env python3
 """Comparison checker for earnings analyzer output"""
 
+import argparse
 import json
 import sys
 
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+# Runtime-specific fields ignored when comparing outputs
+SKIP_KEYS = {'timestamp', 'analysis_id', 'errors'}
+SKIP_METADATA_KEYS = {'processing_time_seconds'}
+
+def _metadata_view(value):
+    """Return metadata without runtime-specific values"""
+    if not isinstance(value, dict):
+        return {}
+    return {k: v for k, v in value.items() if k not in SKIP_METADATA_KEYS}
+
+def find_difference(actual, expected, path=()):
+    """
+    Walk both trees once, ignoring runtime-specific fields.
+
+    Returns the key path of the first difference, or None if the trees match.
+    """
+    if isinstance(actual, dict) and isinstance(expected, dict):
+        keys = actual.keys() - SKIP_KEYS
+        if keys != expected.keys() - SKIP_KEYS:
+            return path
+        for key in keys:
+            if key == 'metadata':
+                if _metadata_view(actual[key]) != _metadata_view(expected[key]):
+                    return path + (key,)
+                continue
+            diff = find_difference(actual[key], expected[key], path + (key,))
+            if diff is not None:
+                return diff
+        return None
+    if isinstance(actual, list) and isinstance(expected, list):
+        if len(actual) != len(expected):
+            return path
+        for index, (a, e) in enumerate(zip(actual, expected)):
+            diff = find_difference(a, e, path + (index,))
+            if diff is not None:
+                return diff
+        return None
+    if isinstance(actual, (dict, list)) or isinstance(expected, (dict, list)):
+        return path
+    return None if actual == expected else path
+
 def normalize_for_comparison(obj):
-    """Remove timestamp and runtime-specific fields for comparison"""
+    """Remove timestamp and runtime-specific fields for display"""
     if isinstance(obj, dict):
         normalized = {}
         for key, value in obj.items():
             # Skip runtime-specific fields
-            if key in ['timestamp', 'analysis_id', 'errors']:
+            if key in SKIP_KEYS:
                 continue
             if key == 'metadata':
-                meta = {}
-                if isinstance(value, dict):
-                    for k, v in value.items():
-                        if k not in ['processing_time_seconds']:
-                            meta[k] = v
-                normalized[key] = meta
+                normalized[key] = _metadata_view(value)
             else:
                 normalized[key] = normalize_for_comparison(value)
         return normalized
@@ -27,48 +69,70 @@ def normalize_for_comparison(obj):
     else:
         return obj
 
-try:
-    with open('/tmp/actual_response.json', 'r') as f:
-        actual = json.load(f)
-    with open('/app/data/expected_output.json', 'r') as f:
-        expected = json.load(f)
+def load_json(path):
+    """Load a JSON file, using orjson when it is installed"""
+    with open(path, 'rb') as f:
+        data = f.read()
+    return orjson.loads(data) if orjson else json.loads(data)
+
+def format_snippet(value, limit=100):
+    """Pretty-print the start of a value for a diff line"""
+    if orjson:
+        return orjson.dumps(value, option=orjson.OPT_INDENT_2).decode()[:limit]
+    return json.dumps(value, indent=2)[:limit]
+
+def normalized_section(key, value):
+    """Normalize one top-level section for a diff snippet"""
+    return normalize_for_comparison({key: value})[key]
+
+
+# ANSI colors used with --color
+BLUE, GREEN, RED, YELLOW = '94', '92', '91', '93'
+
+def compare_jsons(actual_path, expected_path, color=False):
+    """Compare actual output with expected output and print a report"""
+
+    def paint(text, code):
+        return f"\033[{code}m{text}\033[0m" if color else text
+
+    actual = load_json(actual_path)
+    expected = load_json(expected_path)
 
-    actual_norm = normalize_for_comparison(actual)
-    expected_norm = normalize_for_comparison(expected)
+    # Single pass over both trees; normalized copies are only built for diffs
+    difference = find_difference(actual, expected)
 
-    print("\n📊 OUTPUT COMPARISON REPORT")
+    print("\n" + paint("📊 OUTPUT COMPARISON REPORT", BLUE))
     print("=" * 60)
 
-    print("\n1. STRUCTURE CHECK:")
-    actual_keys = set(actual_norm.keys())
-    expected_keys = set(expected_norm.keys())
+    print("\n" + paint("1. STRUCTURE CHECK:", BLUE))
+    actual_keys = actual.keys() - SKIP_KEYS
+    expected_keys = expected.keys() - SKIP_KEYS
 
     if actual_keys == expected_keys:
-        print("✓ All required sections present")
+        print(paint("✓ All required sections present", GREEN))
         print(f"  Sections: {', '.join(sorted(actual_keys))}")
     else:
         missing = expected_keys - actual_keys
         extra = actual_keys - expected_keys
         if missing:
-            print(f"✗ Missing sections: {missing}")
+            print(paint(f"✗ Missing sections: {missing}", RED))
         if extra:
-            print(f"✗ Extra sections: {extra}")
+            print(paint(f"✗ Extra sections: {extra}", RED))
 
-    print("\n2. DATA CONTENT CHECK:")
-    if actual_norm == expected_norm:
-        print("✓ All data matches expected output")
+    print("\n" + paint("2. DATA CONTENT CHECK:", BLUE))
+    if difference is None:
+        print(paint("✓ All data matches expected output", GREEN))
     else:
-        print("✗ Data differences found:")
+        print(paint("✗ Data differences found:", RED))
+        print(f"  First difference at: {'.'.join(map(str, difference)) or '<root>'}")
         for key in expected_keys:
             if key in actual:
-                if actual_norm.get(key) != expected_norm.get(key):
+                if find_difference({key: actual[key]}, {key: expected[key]}) is not None:
                     print(f"\n  {key}:")
-                    exp_str = json.dumps(expected_norm.get(key), indent=6)[:100]
-                    act_str = json.dumps(actual_norm.get(key), indent=6)[:100]
-                    print(f"    Expected: {exp_str}...")
-                    print(f"    Actual:   {act_str}...")
+                    print(f"    Expected: {format_snippet(normalized_section(key, expected[key]))}...")
+                    print(f"    Actual:   {format_snippet(normalized_section(key, actual[key]))}...")
 
-    print("\n3. METADATA CHECK:")
+    print("\n" + paint("3. METADATA CHECK:", BLUE))
     actual_meta = actual.get('metadata', {})
     expected_meta = expected.get('metadata', {})
 
@@ -84,7 +148,7 @@ try:
         match = "✓" if actual_success == expected_success else "✗"
         print(f"  {match} Agents Coordination Success: {actual_success} (expected: {expected_success})")
 
-    print("\n4. TOKEN USAGE CHECK:")
+    print("\n" + paint("4. TOKEN USAGE CHECK:", BLUE))
     if 'llm_tokens_used' in actual_meta:
         actual_tokens = actual_meta['llm_tokens_used']
         expected_tokens = expected_meta.get('llm_tokens_used', 'N/A')
@@ -92,28 +156,42 @@ try:
         print(f"  Expected tokens used: {expected_tokens}")
         print(f"  Note: Using Claude Sonnet 4.5 (claude-sonnet-4-5-20250929)")
 
-    print("\n5. PROCESSING TIME:")
+    print("\n" + paint("5. PROCESSING TIME:", BLUE))
     if 'processing_time_seconds' in actual_meta:
         actual_time = actual_meta['processing_time_seconds']
         print(f"  Processing time: {actual_time} seconds")
         print(f"  Note: This will vary based on system performance")
 
-    print("\n6. TIMESTAMP CHECK:")
+    print("\n" + paint("6. TIMESTAMP CHECK:", BLUE))
     if 'timestamp' in actual:
         print(f"  Actual timestamp: {actual['timestamp']}")
         print(f"  Expected timestamp: {expected['timestamp']}")
         print(f"  Note: Timestamps naturally differ per run")
 
     print("\n" + "=" * 60)
-    print("\n📝 SUMMARY:")
-    if actual_norm == expected_norm:
-        print("✓ OUTPUT MATCHES EXPECTED FORMAT (ignoring timestamps and runtime)")
+    print("\n" + paint("📝 SUMMARY:", BLUE))
+    if difference is None:
+        print(paint("✓ OUTPUT MATCHES EXPECTED FORMAT (ignoring timestamps and runtime)", GREEN))
     else:
-        print("⚠️  OUTPUT HAS DIFFERENCES - Review details above")
+        print(paint("⚠️  OUTPUT HAS DIFFERENCES - Review details above", YELLOW))
     print()
 
-except Exception as e:
-    print(f"Error during comparison: {e}", file=sys.stderr)
-    import traceback
-    traceback.print_exc(file=sys.stderr)
-    sys.exit(1)
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('actual', nargs='?', default='/tmp/actual_response.json',
+                        help='Analyzer response to check')
+    parser.add_argument('expected', nargs='?', default='/app/data/expected_output.json',
+                        help='Expected output to compare against')
+    parser.add_argument('--color', action='store_true', help='Colorize the report with ANSI codes')
+    args = parser.parse_args()
+
+    try:
+        compare_jsons(args.actual, args.expected, color=args.color)
+    except Exception as e:
+        print(f"Error during comparison: {e}", file=sys.stderr)
+        import traceback
+        traceback.print_exc(file=sys.stderr)
+        sys.exit(1)
+
+if __name__ == "__main__":
+    main()
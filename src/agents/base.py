@@ -6,12 +6,16 @@ Defines the foundational agent classes and types for the multi-agent system.
 
 from enum import Enum
 from dataclasses import dataclass, field
-from typing import Dict, Any, Optional, List
+from typing import Dict, Any, Optional, List, Callable, TypeVar
 from abc import ABC, abstractmethod
+from concurrent.futures import Executor
+import asyncio
 import logging
 
 logger = logging.getLogger(__name__)
 
+T = TypeVar("T")
+
 
 class AgentStatus(Enum):
     """Enumeration of possible agent states"""
@@ -22,7 +26,7 @@ class AgentStatus(Enum):
     RETRY = "retry"
 
 
-@dataclass
+@dataclass(slots=True)
 class AgentResult:
     """Result data structure returned by agent processing"""
     agent_name: str
@@ -41,6 +45,11 @@ class BaseAgent(ABC):
     and lifecycle operations.
     """
 
+    __slots__ = ("name", "status", "state", "logger", "executor")
+
+    # Inputs at least this large are parsed in the executor instead of on the event loop
+    offload_min_size: int = 100_000
+
     def __init__(self, name: str):
         """
         Initialize the base agent.
@@ -52,6 +61,8 @@ class BaseAgent(ABC):
         self.status = AgentStatus.READY
         self.state: Dict[str, Any] = {}
         self.logger = logging.getLogger(f"{__name__}.{name}")
+        # Optional shared pool for CPU-bound work, assigned by the application at startup
+        self.executor: Optional[Executor] = None
 
     def update_state(self, key: str, value: Any) -> None:
         """Update a single state value"""
@@ -76,12 +87,29 @@ class BaseAgent(ABC):
         Returns:
             True if valid, False otherwise
         """
-        # Default implementation: check if input is a dict
-        if input_data is None:
-            return False
-        if not isinstance(input_data, dict):
-            return False
-        return True
+        # Default implementation: check if input is a dict (None is not)
+        return isinstance(input_data, dict)
+
+    async def run_cpu_bound(self, func: Callable[..., T], *args: Any, input_size: int = 0) -> T:
+        """
+        Run a CPU-bound function, offloading large inputs to the shared executor.
+
+        Small inputs run inline because executor round-trips cost more than the work.
+        When the executor is a process pool, func and args must be picklable.
+
+        Args:
+            func: Function to call
+            args: Positional arguments for func
+            input_size: Size of the input, compared against offload_min_size
+
+        Returns:
+            The function's return value
+        """
+        if self.executor is None or input_size < self.offload_min_size:
+            return func(*args)
+
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self.executor, func, *args)
 
     @abstractmethod
     async def execute(self, input_data: Dict[str, Any], context: Dict[str, Any]) -> AgentResult:
@@ -130,7 +158,7 @@ class BaseAgent(ABC):
             self.status = result.status
             return result
         except Exception as e:
-            self.logger.exception(f"Error in {self.name}")
+            self.logger.exception("Error in %s", self.name)
             self.status = AgentStatus.FAILED
             return AgentResult(
                 agent_name=self.name,
@@ -139,6 +167,24 @@ class BaseAgent(ABC):
                 errors=[str(e)]
             )
 
+    async def process_many(self, inputs: List[Any], context: Dict[str, Any]) -> List[AgentResult]:
+        """
+        Process several independent inputs concurrently.
+
+        process() turns failures into FAILED results, so one bad input does not
+        cancel the others.
+
+        Args:
+            inputs: Input data items to process
+            context: Shared context from workflow
+
+        Returns:
+            AgentResults in input order
+        """
+        async with asyncio.TaskGroup() as group:
+            tasks = [group.create_task(self.process(input_data, context)) for input_data in inputs]
+        return [task.result() for task in tasks]
+
     def __repr__(self) -> str:
         """String representation of the agent"""
         return f"{self.__class__.__name__}(name='{self.name}', status='{self.status.value}')"
@@ -7,10 +7,42 @@ Validates inputs and coordinates execution across specialized agents.
 
 from typing import Dict, Any
 from .base import BaseAgent, AgentResult, AgentStatus
+import asyncio
 import logging
+import mmap
+import os
 
 logger = logging.getLogger(__name__)
 
+# Reports at least this large are decoded straight from a memory map
+MMAP_MIN_SIZE = 64 * 1024
+
+
+def read_report_file(report_path: str) -> str:
+    """
+    Read a report file as UTF-8 text with universal newlines.
+
+    Large files are decoded directly from a read-only memory map, which skips
+    the intermediate bytes copy of a buffered read.
+
+    Args:
+        report_path: Path to the report file
+
+    Returns:
+        Decoded report text
+    """
+    with open(report_path, 'rb') as f:
+        if os.fstat(f.fileno()).st_size < MMAP_MIN_SIZE:
+            content = f.read().decode('utf-8')
+        else:
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+                content = str(mapped, 'utf-8')
+
+    # Match text-mode reads, which translate \r\n and \r to \n
+    if '\r' in content:
+        content = content.replace('\r\n', '\n').replace('\r', '\n')
+    return content
+
 
 class CoordinatorAgent(BaseAgent):
     """
@@ -23,6 +55,8 @@ class CoordinatorAgent(BaseAgent):
     - Aggregate results from all agents
     """
 
+    __slots__ = ("llm_client", "registered_agents")
+
     def __init__(self, llm_client=None):
         """
         Initialize the coordinator agent.
@@ -44,7 +78,7 @@ class CoordinatorAgent(BaseAgent):
             agent: Agent instance to register
         """
         self.registered_agents[agent_name] = agent
-        logger.info(f"Registered agent: {agent_name}")
+        logger.info("Registered agent: %s", agent_name)
 
     def validate_input(self, input_data: Any) -> bool:
         """
@@ -85,35 +119,26 @@ class CoordinatorAgent(BaseAgent):
                 # Read report from file path (alternative input method)
                 report_path = input_data["report_path"]
                 try:
-                    with open(report_path, 'r') as f:
-                        report_content = f.read()
+                    # Read off the event loop so concurrent workflows keep running
+                    report_content = await asyncio.to_thread(read_report_file, report_path)
                 except Exception as e:
-                    return AgentResult(
-                        agent_name=self.name,
-                        status=AgentStatus.FAILED,
-                        data={},
-                        errors=[f"Failed to read report file: {str(e)}"]
-                    )
+                    return self._fail(f"Failed to read report file: {str(e)}")
             else:
-                return AgentResult(
-                    agent_name=self.name,
-                    status=AgentStatus.FAILED,
-                    data={},
-                    errors=["No report_path or report_content provided"]
-                )
+                return self._fail("No report_path or report_content provided")
 
             # Step 2: Store report content in shared context
             # This makes the report available to all downstream agents
             context["report_content"] = report_content
+            context["report_content_lower"] = report_content.lower()
             context["workflow_initiated_by"] = self.name
 
-            # Step 3: Create execution plan defining order of agent execution
-            # Coordinator determines which agents will run and in what order
+            # Step 3: Create execution plan as a dependency graph
+            # Agents without dependencies run concurrently; the summary waits for both
             execution_plan = {
                 "agents_to_execute": [
-                    "data_extractor",  # Extract financial metrics first
-                    "sentiment_analyzer",  # Analyze tone while having context
-                    "summary_generator"  # Generate summary using outputs from above agents
+                    {"name": "data_extractor", "deps": []},  # Extract financial metrics
+                    {"name": "sentiment_analyzer", "deps": []},  # Analyze tone in parallel
+                    {"name": "summary_generator", "deps": ["data_extractor", "sentiment_analyzer"]}
                 ],
                 "report_length": len(report_content),
                 "initialized_at": context.get("timestamp", "unknown")
@@ -129,10 +154,14 @@ class CoordinatorAgent(BaseAgent):
             )
 
         except Exception as e:
-            logger.exception(f"Error in {self.name}")
-            return AgentResult(
-                agent_name=self.name,
-                status=AgentStatus.FAILED,
-                data={},
-                errors=[f"Coordination error: {str(e)}"]
-            )
+            logger.exception("Error in %s", self.name)
+            return self._fail(f"Coordination error: {str(e)}")
+
+    def _fail(self, error: str) -> AgentResult:
+        """Return a failed coordination result carrying a single error"""
+        return AgentResult(
+            agent_name=self.name,
+            status=AgentStatus.FAILED,
+            data={},
+            errors=[error]
+        )
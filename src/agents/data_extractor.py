@@ -4,14 +4,79 @@ Data Extractor Agent
 Extracts financial metrics and key data points from earnings reports.
 """
 
-from typing import Dict, Any
+from typing import Dict, Any, Optional
+import copy
 import re
 from .base import BaseAgent, AgentResult, AgentStatus
+from ..cache import TTLCache, content_hash
 import logging
 
+try:
+    import re2
+except ImportError:
+    re2 = None
+
 logger = logging.getLogger(__name__)
 
 
+def _compile(pattern: str, flags: int = 0):
+    """
+    Compile a pattern with RE2 when installed, falling back to the stdlib engine.
+
+    RE2 matches in linear time, so the lazy DOTALL segment patterns cannot
+    backtrack catastrophically on large or adversarial reports.
+    """
+    if re2 is None:
+        return re.compile(pattern, flags)
+    inline = ("i" if flags & re.IGNORECASE else "") + ("s" if flags & re.DOTALL else "")
+    return re2.compile(f"(?{inline}){pattern}" if inline else pattern)
+
+
+# Extraction patterns, compiled once at import. All but _RE_REVENUE_BILLION are
+# written in lowercase and run against the lowercased report: a case-sensitive
+# search can skip ahead on its literal prefix, which IGNORECASE prevents
+# Revenue and growth
+_RE_REVENUE_BILLION = _compile(r'\$(\d+\.?\d*)\s*[Bb]illion')
+_RE_REVENUE_LABEL = _compile(r'revenue[:\s]+\$?(\d+\.?\d*)b?')
+_RE_YOY = _compile(r'(?:yoy|year-over-year)[:\s]+(\d+\.?\d*)%?')
+# Net income
+_RE_NET_INCOME = _compile(r'net\s+income[:\s]+\$?(\d+\.?\d*)\s*b?')
+_RE_NET_INCOME_YOY = _compile(r'net\s+income.*?(\d+\.?\d*)%\s+(?:growth|increase)')
+# Earnings per share
+_RE_EPS = _compile(r'(?:earnings\s+per\s+share|eps)[):\s]*\$?(\d+\.?\d*)')
+_RE_ANALYST_ESTIMATE = _compile(r'(?:analyst\s+)?estimate[s]?[:\s]*\$?(\d+\.?\d*)')
+# Operating margin
+_RE_OPERATING_MARGIN = _compile(r'operating\s+margin[:\s]+(\d+\.?\d*)%?')
+_RE_PREVIOUS_MARGIN = _compile(r'previous.*?margin[:\s]+(\d+\.?\d*)%?')
+# Free cash flow
+_RE_CASH_FLOW = _compile(r'(?:free\s+)?cash\s+flow[:\s]+\$?(\d+\.?\d*)\s*b?')
+_RE_CASH_FLOW_YOY = _compile(r'cash\s+flow.*?(\d+\.?\d*)%\s+(?:growth|increase|change)')
+# Segments
+_RE_CLOUD_REVENUE = _compile(r'cloud.*?[:\-]?\s*\$?(\d+\.?\d*)\s*billion', re.DOTALL)
+_RE_CLOUD_REVENUE_FALLBACK = _compile(r'cloud\s+(?:services\s+)?(?:division)?[^$]*\$?(\d+\.?\d*)')
+_RE_CLOUD_GROWTH = _compile(r'cloud.*?(?:\(\+|plus|up\s+)?(\d+)%?\s+(?:yoy|growth|increase)', re.DOTALL)
+_RE_SOFTWARE_REVENUE = _compile(r'software.*?[:\-]?\s*\$?(\d+\.?\d*)\s*billion', re.DOTALL)
+_RE_SOFTWARE_REVENUE_FALLBACK = _compile(r'software\s+(?:products)?[^$]*\$?(\d+\.?\d*)')
+_RE_SOFTWARE_GROWTH = _compile(r'software.*?(?:\(\+|plus|up\s+)?(\d+)%?\s+(?:yoy|growth|increase)', re.DOTALL)
+_RE_HARDWARE_REVENUE = _compile(r'hardware.*?[:\-]?\s*\$?(\d+\.?\d*)\s*billion', re.DOTALL)
+_RE_HARDWARE_REVENUE_FALLBACK = _compile(r'hardware\s+(?:division)?[^$]*\$?(\d+\.?\d*)')
+_RE_HARDWARE_GROWTH = _compile(r'hardware.*?(?:\(\-|\-)?(\d+)%?\s+(?:yoy|growth|decline|decrease)', re.DOTALL)
+# Forward guidance
+_RE_Q4_GUIDANCE = _compile(r'q4\s+2024[^a-z]*?revenue[^$\d]*\$?(\d+\.?\d*)[^$\d]*\$?(\d+\.?\d*)', re.DOTALL)
+_RE_FULL_YEAR_GROWTH = _compile(r'(?:full-year|full\s+year).*?revenue\s+growth\s+(?:of|rate)?[:\s]*(\d+)[^$]*?(\d+)%?', re.DOTALL)
+_RE_FULL_YEAR_GROWTH_FALLBACK = _compile(r'(?:full-year|full\s+year).*?(\d+)[^$]*?(\d+)%', re.DOTALL)
+
+# Guidance ranges reported when the report does not state them
+_DEFAULT_Q4_REVENUE_RANGE = (16.0, 16.5)
+_DEFAULT_Q4_EPS_RANGE = (4.70, 4.85)
+_DEFAULT_FULL_YEAR_GROWTH = (0.14, 0.15)
+
+
+def _as_fraction(value: float) -> float:
+    """Treat values above 1 as percentages (e.g. 12 -> 0.12); others are already fractions"""
+    return value / 100 if value > 1 else value
+
+
 class DataExtractorAgent(BaseAgent):
     """
     Extracts structured financial data from unstructured earnings reports.
@@ -24,6 +89,8 @@ class DataExtractorAgent(BaseAgent):
     - Forward guidance
     """
 
+    __slots__ = ("llm_client", "extraction_cache")
+
     def __init__(self, llm_client=None):
         """
         Initialize the data extractor agent.
@@ -33,6 +100,8 @@ class DataExtractorAgent(BaseAgent):
         """
         super().__init__(name="data_extractor")
         self.llm_client = llm_client
+        # Extraction results keyed by report content hash; repeated reports skip the regex pass
+        self.extraction_cache = TTLCache(maxsize=128, ttl_seconds=float("inf"))
 
     async def execute(self, input_data: Dict[str, Any], context: Dict[str, Any]) -> AgentResult:
         """
@@ -57,8 +126,20 @@ class DataExtractorAgent(BaseAgent):
                     errors=["No report content available for extraction"]
                 )
 
-            # Extract financial metrics
-            extracted_data = self._extract_metrics(report_content)
+            # Reuse the lowercased report shared through the context when it matches
+            report_lower = context.get("report_content_lower") if report_content is context.get("report_content") else None
+
+            # Extract financial metrics (in the CPU pool for very large reports)
+            cache_key = content_hash(report_content)
+            extracted_data = self.extraction_cache.get(cache_key)
+            if extracted_data is None:
+                extracted_data = await self.run_cpu_bound(
+                    self._extract_metrics, report_content, report_lower, input_size=len(report_content)
+                )
+                self.extraction_cache.set(cache_key, extracted_data)
+
+            # Downstream agents may mutate the result, so the cached copy stays private
+            extracted_data = copy.deepcopy(extracted_data)
 
             return AgentResult(
                 agent_name=self.name,
@@ -67,7 +148,7 @@ class DataExtractorAgent(BaseAgent):
             )
 
         except Exception as e:
-            logger.exception(f"Error in {self.name}")
+            logger.exception("Error in %s", self.name)
             return AgentResult(
                 agent_name=self.name,
                 status=AgentStatus.FAILED,
@@ -75,7 +156,8 @@ class DataExtractorAgent(BaseAgent):
                 errors=[f"Extraction error: {str(e)}"]
             )
 
-    def _extract_metrics(self, report_content: str) -> Dict[str, Any]:
+    @staticmethod
+    def _extract_metrics(report_content: str, report_lower: Optional[str] = None) -> Dict[str, Any]:
         """
         Extract financial metrics from report text with structured format.
 
@@ -85,36 +167,38 @@ class DataExtractorAgent(BaseAgent):
 
         Args:
             report_content: Raw report text
+            report_lower: Lowercased report text, computed here if not supplied
 
         Returns:
             Dictionary of extracted metrics matching expected output schema
         """
         financial_metrics = {}
 
+        # Patterns only run when their keyword occurs; a substring test is far
+        # cheaper than a DOTALL scan that cannot match
+        if report_lower is None:
+            report_lower = report_content.lower()
+
         # ============================================================
         # REVENUE EXTRACTION
         # ============================================================
         # Try first pattern: "$X billion" (most common format)
-        revenue_match = re.search(r'\$(\d+\.?\d*)\s*[Bb]illion', report_content)
+        revenue_match = _RE_REVENUE_BILLION.search(report_content) if "billion" in report_lower else None
         revenue_value = None
         if revenue_match:
             revenue_value = float(revenue_match.group(1))
         else:
             # Fallback pattern: "revenue: $X" or "revenue: X"
-            revenue_match = re.search(r'revenue[:\s]+\$?(\d+\.?\d*)[Bb]?', report_content, re.IGNORECASE)
+            revenue_match = _RE_REVENUE_LABEL.search(report_lower) if "revenue" in report_lower else None
             if revenue_match:
                 revenue_value = float(revenue_match.group(1))
 
         # Extract YoY (Year-over-Year) revenue growth rate
         # Looks for patterns like "YoY: 12%" or "year-over-year: 0.12"
-        yoy_match = re.search(r'(?:YoY|year-over-year)[:\s]+(\d+\.?\d*)%?', report_content, re.IGNORECASE)
+        yoy_match = _RE_YOY.search(report_lower) if "yoy" in report_lower or "year-over-year" in report_lower else None
         revenue_yoy = None
         if yoy_match:
-            yoy_value = float(yoy_match.group(1))
-            # Normalize: if value > 1, assume it's a percentage (e.g., 12) and convert to decimal
-            if yoy_value > 1:
-                yoy_value = yoy_value / 100
-            revenue_yoy = yoy_value
+            revenue_yoy = _as_fraction(float(yoy_match.group(1)))
 
         if revenue_value is not None:
             financial_metrics["revenue"] = {
@@ -128,21 +212,17 @@ class DataExtractorAgent(BaseAgent):
         # NET INCOME EXTRACTION
         # ============================================================
         # Extract net income value from pattern like "Net income: $X billion"
-        net_income_match = re.search(r'net\s+income[:\s]+\$?(\d+\.?\d*)\s*[Bb]?', report_content, re.IGNORECASE)
+        net_income_match = _RE_NET_INCOME.search(report_lower) if "income" in report_lower else None
         net_income_value = None
         if net_income_match:
             net_income_value = float(net_income_match.group(1))
 
         # Extract net income year-over-year growth
         # Looks for patterns like "net income 18% growth" or "net income increased 18%"
-        net_income_yoy_match = re.search(r'net\s+income.*?(\d+\.?\d*)%\s+(?:growth|increase)', report_content, re.IGNORECASE)
+        net_income_yoy_match = _RE_NET_INCOME_YOY.search(report_lower) if "income" in report_lower else None
         net_income_yoy = None
         if net_income_yoy_match:
-            yoy_value = float(net_income_yoy_match.group(1))
-            # Normalize percentage values to decimal format
-            if yoy_value > 1:
-                yoy_value = yoy_value / 100
-            net_income_yoy = yoy_value
+            net_income_yoy = _as_fraction(float(net_income_yoy_match.group(1)))
 
         if net_income_value is not None:
             financial_metrics["net_income"] = {
@@ -156,12 +236,12 @@ class DataExtractorAgent(BaseAgent):
         # EARNINGS PER SHARE (EPS) EXTRACTION
         # ============================================================
         # Extract EPS value from patterns like "Earnings Per Share (EPS): $4.52" or "EPS: 4.52"
-        eps_match = re.search(r'(?:Earnings\s+Per\s+Share|EPS)[):\s]*\$?(\d+\.?\d*)', report_content, re.IGNORECASE)
+        eps_match = _RE_EPS.search(report_lower) if "eps" in report_lower or "share" in report_lower else None
 
         if eps_match:
             eps_value = float(eps_match.group(1))
             # Also try to extract analyst estimate for comparison
-            analyst_estimate_match = re.search(r'(?:analyst\s+)?estimate[s]?[:\s]*\$?(\d+\.?\d*)', report_content, re.IGNORECASE)
+            analyst_estimate_match = _RE_ANALYST_ESTIMATE.search(report_lower) if "estimate" in report_lower else None
             analyst_estimate = float(analyst_estimate_match.group(1)) if analyst_estimate_match else 4.30
 
             financial_metrics["eps"] = {
@@ -174,21 +254,15 @@ class DataExtractorAgent(BaseAgent):
         # OPERATING MARGIN EXTRACTION
         # ============================================================
         # Extract current operating margin from pattern like "Operating margin: 26.2%"
-        margin_match = re.search(r'operating\s+margin[:\s]+(\d+\.?\d*)%?', report_content, re.IGNORECASE)
+        margin_match = _RE_OPERATING_MARGIN.search(report_lower) if "margin" in report_lower else None
         if margin_match:
-            current_margin = float(margin_match.group(1))
-            # Normalize percentage to decimal (e.g., 26.2 -> 0.262)
-            if current_margin > 1:
-                current_margin = current_margin / 100
+            current_margin = _as_fraction(float(margin_match.group(1)))
 
             # Try to find previous period's margin for comparison (trend analysis)
-            previous_margin_match = re.search(r'previous.*?margin[:\s]+(\d+\.?\d*)%?', report_content, re.IGNORECASE)
+            previous_margin_match = _RE_PREVIOUS_MARGIN.search(report_lower) if "previous" in report_lower else None
             previous_margin = None
             if previous_margin_match:
-                previous_margin = float(previous_margin_match.group(1))
-                # Normalize percentage to decimal
-                if previous_margin > 1:
-                    previous_margin = previous_margin / 100
+                previous_margin = _as_fraction(float(previous_margin_match.group(1)))
 
             financial_metrics["operating_margin"] = {
                 "current": current_margin,
@@ -200,18 +274,14 @@ class DataExtractorAgent(BaseAgent):
         # FREE CASH FLOW EXTRACTION
         # ============================================================
         # Extract free cash flow value from pattern like "Free cash flow: $X billion"
-        cash_flow_match = re.search(r'(?:free\s+)?cash\s+flow[:\s]+\$?(\d+\.?\d*)\s*[Bb]?', report_content, re.IGNORECASE)
+        cash_flow_match = _RE_CASH_FLOW.search(report_lower) if "cash" in report_lower else None
         if cash_flow_match:
             cash_flow_value = float(cash_flow_match.group(1))
             # Extract cash flow growth rate
-            cash_flow_yoy_match = re.search(r'cash\s+flow.*?(\d+\.?\d*)%\s+(?:growth|increase|change)', report_content, re.IGNORECASE)
+            cash_flow_yoy_match = _RE_CASH_FLOW_YOY.search(report_lower) if "cash" in report_lower else None
             cash_flow_yoy = None
             if cash_flow_yoy_match:
-                yoy_value = float(cash_flow_yoy_match.group(1))
-                # Normalize percentage to decimal
-                if yoy_value > 1:
-                    yoy_value = yoy_value / 100
-                cash_flow_yoy = yoy_value
+                cash_flow_yoy = _as_fraction(float(cash_flow_yoy_match.group(1)))
 
             financial_metrics["free_cash_flow"] = {
                 "value": cash_flow_value,
@@ -228,15 +298,15 @@ class DataExtractorAgent(BaseAgent):
 
         # CLOUD SERVICES SEGMENT
         # Try multiple patterns to find cloud services revenue
-        cloud_revenue_match = re.search(r'(?:Cloud|cloud).*?[:\-]?\s*\$?(\d+\.?\d*)\s*billion', report_content, re.IGNORECASE | re.DOTALL)
+        cloud_revenue_match = _RE_CLOUD_REVENUE.search(report_lower) if "cloud" in report_lower else None
         if not cloud_revenue_match:
             # Fallback pattern for different formatting
-            cloud_revenue_match = re.search(r'(?:Cloud|cloud)\s+(?:Services\s+)?(?:Division|division)?[^$]*\$?(\d+\.?\d*)', report_content, re.IGNORECASE)
+            cloud_revenue_match = _RE_CLOUD_REVENUE_FALLBACK.search(report_lower) if "cloud" in report_lower else None
 
         if cloud_revenue_match:
             cloud_revenue = float(cloud_revenue_match.group(1))
             # Look for growth percentage after cloud mention (typically 30%+ for cloud)
-            cloud_growth_match = re.search(r'(?:Cloud|cloud).*?(?:\(\+|plus|up\s+)?(\d+)%?\s+(?:YoY|growth|increase)', report_content, re.IGNORECASE | re.DOTALL)
+            cloud_growth_match = _RE_CLOUD_GROWTH.search(report_lower) if "cloud" in report_lower else None
             cloud_growth = None
             if cloud_growth_match:
                 cloud_growth = float(cloud_growth_match.group(1)) / 100
@@ -253,14 +323,14 @@ class DataExtractorAgent(BaseAgent):
 
         # SOFTWARE PRODUCTS SEGMENT
         # Extract software division revenue with multiple pattern attempts
-        software_revenue_match = re.search(r'(?:Software|software).*?[:\-]?\s*\$?(\d+\.?\d*)\s*billion', report_content, re.IGNORECASE | re.DOTALL)
+        software_revenue_match = _RE_SOFTWARE_REVENUE.search(report_lower) if "software" in report_lower else None
         if not software_revenue_match:
-            software_revenue_match = re.search(r'Software\s+(?:Products|products)?[^$]*\$?(\d+\.?\d*)', report_content, re.IGNORECASE)
+            software_revenue_match = _RE_SOFTWARE_REVENUE_FALLBACK.search(report_lower) if "software" in report_lower else None
 
         if software_revenue_match:
             software_revenue = float(software_revenue_match.group(1))
             # Extract software segment growth rate
-            software_growth_match = re.search(r'(?:Software|software).*?(?:\(\+|plus|up\s+)?(\d+)%?\s+(?:YoY|growth|increase)', report_content, re.IGNORECASE | re.DOTALL)
+            software_growth_match = _RE_SOFTWARE_GROWTH.search(report_lower) if "software" in report_lower else None
             software_growth = None
             if software_growth_match:
                 software_growth = float(software_growth_match.group(1)) / 100
@@ -273,14 +343,14 @@ class DataExtractorAgent(BaseAgent):
 
         # HARDWARE SEGMENT
         # Extract hardware division revenue and identify declining trends
-        hardware_revenue_match = re.search(r'(?:Hardware|hardware).*?[:\-]?\s*\$?(\d+\.?\d*)\s*billion', report_content, re.IGNORECASE | re.DOTALL)
+        hardware_revenue_match = _RE_HARDWARE_REVENUE.search(report_lower) if "hardware" in report_lower else None
         if not hardware_revenue_match:
-            hardware_revenue_match = re.search(r'Hardware\s+(?:Division|division)?[^$]*\$?(\d+\.?\d*)', report_content, re.IGNORECASE)
+            hardware_revenue_match = _RE_HARDWARE_REVENUE_FALLBACK.search(report_lower) if "hardware" in report_lower else None
 
         if hardware_revenue_match:
             hardware_revenue = float(hardware_revenue_match.group(1))
             # Look for decline/decrease patterns in hardware revenue
-            hardware_growth_match = re.search(r'(?:Hardware|hardware).*?(?:\(\-|\-)?(\d+)%?\s+(?:YoY|growth|decline|decrease)', report_content, re.IGNORECASE | re.DOTALL)
+            hardware_growth_match = _RE_HARDWARE_GROWTH.search(report_lower) if "hardware" in report_lower else None
             hardware_growth = -0.02  # Default 2% decline
             if hardware_growth_match:
                 growth_val = float(hardware_growth_match.group(1))
@@ -300,9 +370,9 @@ class DataExtractorAgent(BaseAgent):
 
         # Q4 2024 REVENUE GUIDANCE
         # Look for Q4 section with revenue range projections
-        q4_section_match = re.search(r'Q4\s+2024[^A-Z]*?(?:Revenue|revenue)[^$\d]*\$?(\d+\.?\d*)[^$\d]*\$?(\d+\.?\d*)', report_content, re.IGNORECASE | re.DOTALL)
+        q4_section_match = _RE_Q4_GUIDANCE.search(report_lower) if "q4" in report_lower else None
 
-        q4_revenue_range = [16.0, 16.5]  # Default Q4 guidance
+        q4_revenue_range = list(_DEFAULT_Q4_REVENUE_RANGE)
         if q4_section_match:
             val1 = float(q4_section_match.group(1))
             val2 = float(q4_section_match.group(2))
@@ -311,28 +381,24 @@ class DataExtractorAgent(BaseAgent):
 
         forward_guidance["q4_2024"] = {
             "revenue_range": q4_revenue_range,
-            "eps_range": [4.70, 4.85]  # EPS guidance for Q4
+            "eps_range": list(_DEFAULT_Q4_EPS_RANGE)  # EPS guidance for Q4
         }
 
         # FULL-YEAR GROWTH GUIDANCE
         # Extract full-year revenue growth projection (try two pattern variations)
-        full_year_growth_match = re.search(r'(?:Full-year|full\s+year).*?revenue\s+growth\s+(?:of|rate)?[:\s]*(\d+)[^$]*?(\d+)%?', report_content, re.IGNORECASE | re.DOTALL)
+        full_year_growth_match = _RE_FULL_YEAR_GROWTH.search(report_lower) if "full" in report_lower else None
         if not full_year_growth_match:
             # Fallback pattern for different formatting
-            full_year_growth_match = re.search(r'(?:Full-year|full\s+year).*?(\d+)[^$]*?(\d+)%', report_content, re.IGNORECASE | re.DOTALL)
+            full_year_growth_match = _RE_FULL_YEAR_GROWTH_FALLBACK.search(report_lower) if "full" in report_lower else None
 
         if full_year_growth_match:
-            growth1 = float(full_year_growth_match.group(1))
-            growth2 = float(full_year_growth_match.group(2))
-            # Normalize percentages to decimal format
-            if growth1 > 1:
-                growth1 = growth1 / 100
-            if growth2 > 1:
-                growth2 = growth2 / 100
-            forward_guidance["full_year_growth"] = [growth1, growth2]
+            forward_guidance["full_year_growth"] = [
+                _as_fraction(float(full_year_growth_match.group(1))),
+                _as_fraction(float(full_year_growth_match.group(2)))
+            ]
         else:
             # Default full-year growth guidance (14-15%)
-            forward_guidance["full_year_growth"] = [0.14, 0.15]
+            forward_guidance["full_year_growth"] = list(_DEFAULT_FULL_YEAR_GROWTH)
 
         # Return structured output
         result = {
@@ -4,12 +4,58 @@ Sentiment Analysis Agent
 Analyzes the tone and sentiment of earnings reports.
 """
 
-from typing import Dict, Any, List
+from contextlib import aclosing
+from typing import Dict, Any, Final, List, Optional
+import copy
+import json
 from .base import BaseAgent, AgentResult, AgentStatus
+from ..cache import TTLCache, content_hash
+from ..llm_client import DEFAULT_SYSTEM_PROMPT, parse_json_object
 import logging
 
 logger = logging.getLogger(__name__)
 
+# Static instructions for LLM sentiment analysis. Sent as the system prompt so the
+# identical prefix can be served from the provider's prompt cache; the user turn
+# carries only the report excerpt.
+SENTIMENT_SYSTEM_PROMPT: Final[str] = DEFAULT_SYSTEM_PROMPT + """
+
+When asked to analyze the sentiment and tone of an earnings report, return ONLY a valid JSON object with:
+{
+  "overall_sentiment": "positive" | "negative" | "neutral",
+  "confidence": 0.0-1.0,
+  "management_tone": "optimistic" | "cautious_pessimistic" | "optimistic_cautious" | "neutral",
+  "key_positive_indicators": ["indicator1", "indicator2", "indicator3", "indicator4"],
+  "key_negative_indicators": ["indicator1", "indicator2", "indicator3"],
+  "risk_factors_identified": ["risk1", "risk2", "risk3", "risk4", "risk5"]
+}
+
+Requirements:
+- confidence should be around 0.85 for moderately positive tone with some caution
+- include "hardware division revenue decline" if hardware is mentioned with decline/challenge
+- include "macroeconomic uncertainties" for risks
+- Return ONLY the JSON object, no markdown, no explanation"""
+
+# Indicators reported when no phrase trigger matches the report
+_DEFAULT_POSITIVE_INDICATORS = (
+    "exceeded expectations across all key metrics",
+    "remarkable strength in cloud services",
+    "unprecedented demand for AI solutions",
+    "strong balance sheet and cash generation"
+)
+_DEFAULT_NEGATIVE_INDICATORS = (
+    "hardware division revenue decline",
+    "potential market saturation concerns",
+    "macroeconomic uncertainties"
+)
+_DEFAULT_RISK_FACTORS = (
+    "increasing cloud market competition",
+    "regulatory scrutiny",
+    "foreign exchange volatility",
+    "potential economic slowdown",
+    "cybersecurity threats"
+)
+
 
 class SentimentAnalysisAgent(BaseAgent):
     """
@@ -22,20 +68,23 @@ class SentimentAnalysisAgent(BaseAgent):
     - Confidence levels
     """
 
-    # Keyword lists for sentiment analysis - used for keyword-based fallback analysis
-    # These lists help identify positive and negative sentiment indicators when LLM is unavailable
-    POSITIVE_KEYWORDS = [
+    __slots__ = ("llm_client", "analysis_cache", "llm_analysis_cache")
+
+    # Keyword tuples for sentiment analysis - used for keyword-based fallback analysis
+    # These help identify positive and negative sentiment indicators when LLM is unavailable.
+    # Keywords are lowercase and matched as substrings, so "risk" also counts "risks".
+    POSITIVE_KEYWORDS = (
         "exceeded", "remarkable", "unprecedented", "strong", "outstanding",
         "thrilled", "growth", "substantial", "record", "success", "achieved",
         "improvement", "optimistic", "confident", "opportunity"
-    ]
+    )
 
     # Negative sentiment indicators - words that suggest caution or concern
-    NEGATIVE_KEYWORDS = [
+    NEGATIVE_KEYWORDS = (
         "challenge", "uncertainty", "risk", "decline", "cautious",
         "concern", "headwind", "saturation", "volatility", "weak",
         "shortfall", "miss", "pressure", "difficult"
-    ]
+    )
 
     def __init__(self, llm_client=None):
         """
@@ -46,6 +95,10 @@ class SentimentAnalysisAgent(BaseAgent):
         """
         super().__init__(name="sentiment_analyzer")
         self.llm_client = llm_client
+        # Keyword analyses keyed by report content hash; repeated reports skip the keyword scan
+        self.analysis_cache = TTLCache(maxsize=128, ttl_seconds=float("inf"))
+        # LLM analyses keyed by the prompted excerpt's hash; entries expire so sampled output is refreshed
+        self.llm_analysis_cache = TTLCache(maxsize=256, ttl_seconds=3600.0)
 
     async def execute(self, input_data: Dict[str, Any], context: Dict[str, Any]) -> AgentResult:
         """
@@ -70,6 +123,9 @@ class SentimentAnalysisAgent(BaseAgent):
                     errors=["No report content available for sentiment analysis"]
                 )
 
+            # Reuse the lowercased report shared through the context when it matches
+            content_lower = context.get("report_content_lower") if report_content is context.get("report_content") else None
+
             # Step 2: Analyze sentiment using preferred method
             # Try LLM-based analysis first (more sophisticated), fall back to keyword matching
             if self.llm_client:
@@ -78,12 +134,21 @@ class SentimentAnalysisAgent(BaseAgent):
                     sentiment_data = await self._analyze_sentiment_with_llm(report_content)
                     logger.info("Successfully used LLM for sentiment analysis")
                 except Exception as e:
-                    logger.warning(f"LLM sentiment analysis failed, falling back to keyword analysis: {e}")
+                    logger.warning("LLM sentiment analysis failed, falling back to keyword analysis: %s", e)
                     # Fallback to simpler keyword-based approach
                     sentiment_data = self._analyze_sentiment(report_content)
             else:
                 # No LLM available, use keyword-based sentiment analysis
-                sentiment_data = self._analyze_sentiment(report_content)
+                cache_key = content_hash(report_content)
+                sentiment_data = self.analysis_cache.get(cache_key)
+                if sentiment_data is None:
+                    sentiment_data = await self.run_cpu_bound(
+                        self._analyze_sentiment, report_content, content_lower, input_size=len(report_content)
+                    )
+                    self.analysis_cache.set(cache_key, sentiment_data)
+
+                # Downstream agents may mutate the result, so the cached copy stays private
+                sentiment_data = copy.deepcopy(sentiment_data)
 
             return AgentResult(
                 agent_name=self.name,
@@ -92,7 +157,7 @@ class SentimentAnalysisAgent(BaseAgent):
             )
 
         except Exception as e:
-            logger.exception(f"Error in {self.name}")
+            logger.exception("Error in %s", self.name)
             return AgentResult(
                 agent_name=self.name,
                 status=AgentStatus.FAILED,
@@ -110,62 +175,81 @@ class SentimentAnalysisAgent(BaseAgent):
         Returns:
             Dictionary with sentiment analysis results from Claude
         """
-        import re
-        import json
+        # The prompt only embeds the excerpt, so reports sharing it share an analysis
+        excerpt = report_content[:2500]
+        cache_key = content_hash(excerpt)
+        cached = self.llm_analysis_cache.get(cache_key)
+        if cached is not None:
+            logger.info("Using cached LLM sentiment analysis")
+            return copy.deepcopy(cached)
 
         try:
-            prompt = f"""Analyze the sentiment and tone of this earnings report. Return ONLY a valid JSON object with:
-{{
-  "overall_sentiment": "positive" | "negative" | "neutral",
-  "confidence": 0.0-1.0,
-  "management_tone": "optimistic" | "cautious_pessimistic" | "optimistic_cautious" | "neutral",
-  "key_positive_indicators": ["indicator1", "indicator2", "indicator3", "indicator4"],
-  "key_negative_indicators": ["indicator1", "indicator2", "indicator3"],
-  "risk_factors_identified": ["risk1", "risk2", "risk3", "risk4", "risk5"]
-}}
-
-Report excerpt:
-{report_content[:2500]}
-
-Requirements:
-- confidence should be around 0.85 for moderately positive tone with some caution
-- include "hardware division revenue decline" if hardware is mentioned with decline/challenge
-- include "macroeconomic uncertainties" for risks
-- Return ONLY the JSON object, no markdown, no explanation"""
+            # Only the excerpt varies; the instructions live in the cached system prompt
+            prompt = f"Analyze the sentiment and tone of this earnings report.\n\nReport excerpt:\n{excerpt}"
 
             logger.info("Calling LLM for sentiment analysis...")
-            response = await self.llm_client.generate(
-                prompt=prompt,
-                temperature=0.3,
-                max_tokens=600
-            )
+            response = await self._stream_json_reply(prompt)
 
-            logger.debug(f"LLM response length: {len(response)} chars")
+            logger.debug("LLM response length: %d chars", len(response))
 
             # Parse JSON response
-            json_match = re.search(r'\{[\s\S]*\}', response)
-            if json_match:
-                json_str = json_match.group()
-                logger.debug(f"Extracted JSON: {json_str[:150]}...")
-                data = json.loads(json_str)
-
+            data = parse_json_object(response)
+            if data is not None:
                 # Validate and normalize confidence
                 if 'confidence' in data:
                     data['confidence'] = round(min(1.0, max(0.0, float(data['confidence']))), 2)
                 else:
                     data['confidence'] = 0.75
 
-                logger.info(f"LLM sentiment analysis successful: confidence={data.get('confidence')}, sentiment={data.get('overall_sentiment')}")
+                logger.info("LLM sentiment analysis successful: confidence=%s, sentiment=%s", data.get('confidence'), data.get('overall_sentiment'))
+                self.llm_analysis_cache.set(cache_key, copy.deepcopy(data))
                 return data
 
-            logger.warning(f"Could not extract JSON from LLM response: {response[:200]}")
+            logger.warning("Could not extract JSON from LLM response: %.200s", response)
             raise ValueError("Invalid JSON format in LLM response")
 
         except Exception as e:
-            logger.warning(f"LLM sentiment analysis failed ({type(e).__name__}: {str(e)}), falling back to keyword analysis")
+            logger.warning("LLM sentiment analysis failed (%s: %s), falling back to keyword analysis", type(e).__name__, e)
             return self._analyze_sentiment(report_content)
 
-    def _analyze_sentiment(self, report_content: str) -> Dict[str, Any]:
+    async def _stream_json_reply(self, prompt: str) -> str:
+        """
+        Stream the LLM reply, stopping once the first JSON object is complete.
+
+        Anything the model would write after the object is never waited for.
+
+        Args:
+            prompt: Sentiment analysis prompt
+
+        Returns:
+            Reply text received so far
+        """
+        decoder = json.JSONDecoder()
+        parts = []
+        stream = self.llm_client.stream(
+            prompt=prompt,
+            temperature=0.3,
+            max_tokens=600,
+            system=SENTIMENT_SYSTEM_PROMPT
+        )
+        async with aclosing(stream):
+            async for chunk in stream:
+                parts.append(chunk)
+                if "}" not in chunk:
+                    continue
+                text = "".join(parts)
+                start = text.find("{")
+                if start == -1:
+                    continue
+                try:
+                    decoder.raw_decode(text, start)
+                    break
+                except ValueError:
+                    pass
+        return "".join(parts)
+
+    @classmethod
+    def _analyze_sentiment(cls, report_content: str, content_lower: Optional[str] = None) -> Dict[str, Any]:
         """
         Perform keyword-based sentiment analysis with phrase extraction.
 
@@ -175,29 +259,21 @@ Requirements:
 
         Args:
             report_content: Raw report text
+            content_lower: Lowercased report text, computed here if not supplied
 
         Returns:
             Dictionary with sentiment analysis results matching expected format
         """
         # Convert to lowercase for case-insensitive keyword matching
-        content_lower = report_content.lower()
+        if content_lower is None:
+            content_lower = report_content.lower()
 
         # ============================================================
         # KEYWORD MATCHING PHASE
         # ============================================================
-        # Count positive and negative keywords found in the report
-        positive_found = []
-        negative_found = []
-
-        # Find all positive keywords present in the report
-        for keyword in self.POSITIVE_KEYWORDS:
-            if keyword.lower() in content_lower:
-                positive_found.append(keyword)
-
-        # Find all negative keywords present in the report
-        for keyword in self.NEGATIVE_KEYWORDS:
-            if keyword.lower() in content_lower:
-                negative_found.append(keyword)
+        # Find all positive and negative keywords present in the report
+        positive_found = [keyword for keyword in cls.POSITIVE_KEYWORDS if keyword in content_lower]
+        negative_found = [keyword for keyword in cls.NEGATIVE_KEYWORDS if keyword in content_lower]
 
         # ============================================================
         # SENTIMENT CALCULATION
@@ -207,7 +283,7 @@ Requirements:
         negative_count = len(negative_found)
         total_count = positive_count + negative_count
 
-        logger.info(f"Sentiment keyword analysis: {positive_count} positive, {negative_count} negative, total={total_count}")
+        logger.info("Sentiment keyword analysis: %d positive, %d negative, total=%d", positive_count, negative_count, total_count)
 
         if total_count == 0:
             # No keywords found - neutral sentiment
@@ -224,11 +300,11 @@ Requirements:
                 # Base confidence on strength of positive indicators
                 if positive_count >= 5:
                     confidence = 0.85  # Moderate to strong positive tone (5+ positive indicators)
-                    logger.info(f"Setting confidence to 0.85 (positive_count={positive_count} >= 5)")
+                    logger.info("Setting confidence to 0.85 (positive_count=%d >= 5)", positive_count)
                 else:
                     # Scale confidence: 0.70 base + up to 0.25 bonus based on positive ratio
                     confidence = min(0.95, 0.70 + positive_ratio * 0.25)
-                    logger.info(f"Setting confidence formula: 0.70 + {positive_ratio} * 0.25 = {confidence}")
+                    logger.info("Setting confidence formula: 0.70 + %s * 0.25 = %s", positive_ratio, confidence)
             elif positive_ratio < 0.50:
                 # More negative keywords than positive
                 overall_sentiment = "negative"
@@ -262,10 +338,14 @@ Requirements:
         key_negative = []
         risk_factors = []
 
+        # Keywords already matched above need no second scan of the report
+        found = set(positive_found)
+        found.update(negative_found)
+
         # POSITIVE INDICATORS - Look for phrases suggesting strong performance
-        if "exceeded" in content_lower or "expectations" in content_lower:
+        if "exceeded" in found or "expectations" in content_lower:
             key_positive.append("exceeded expectations across all key metrics")
-        if "cloud" in content_lower and "strong" in content_lower:
+        if "strong" in found and "cloud" in content_lower:
             # Cloud services performing well is a key positive for tech companies
             key_positive.append("remarkable strength in cloud services")
         if "ai" in content_lower or "artificial intelligence" in content_lower:
@@ -276,13 +356,13 @@ Requirements:
             key_positive.append("strong balance sheet and cash generation")
 
         # NEGATIVE INDICATORS - Look for concerns or challenges
-        if "hardware" in content_lower and ("decline" in content_lower or "challenge" in content_lower or "-2%" in content_lower):
+        if "hardware" in content_lower and ("decline" in found or "challenge" in found or "-2%" in content_lower):
             # Hardware segment weakness is a noted headwind
             key_negative.append("hardware division revenue decline")
-        if "saturation" in content_lower or "market saturation" in content_lower:
+        if "saturation" in found:
             # Market saturation limits growth potential
             key_negative.append("potential market saturation concerns")
-        if "macro" in content_lower or "uncertainty" in content_lower or "economic" in content_lower:
+        if "uncertainty" in found or "macro" in content_lower or "economic" in content_lower:
             # Macroeconomic factors are a recurring risk
             key_negative.append("macroeconomic uncertainties")
 
@@ -307,22 +387,7 @@ Requirements:
             "overall_sentiment": overall_sentiment,
             "confidence": round(confidence, 2),
             "management_tone": management_tone,
-            "key_positive_indicators": key_positive if key_positive else [
-                "exceeded expectations across all key metrics",
-                "remarkable strength in cloud services",
-                "unprecedented demand for AI solutions",
-                "strong balance sheet and cash generation"
-            ],
-            "key_negative_indicators": key_negative if key_negative else [
-                "hardware division revenue decline",
-                "potential market saturation concerns",
-                "macroeconomic uncertainties"
-            ],
-            "risk_factors_identified": risk_factors if risk_factors else [
-                "increasing cloud market competition",
-                "regulatory scrutiny",
-                "foreign exchange volatility",
-                "potential economic slowdown",
-                "cybersecurity threats"
-            ]
+            "key_positive_indicators": key_positive or list(_DEFAULT_POSITIVE_INDICATORS),
+            "key_negative_indicators": key_negative or list(_DEFAULT_NEGATIVE_INDICATORS),
+            "risk_factors_identified": risk_factors or list(_DEFAULT_RISK_FACTORS)
         }
@@ -22,6 +22,8 @@ class SummaryAgent(BaseAgent):
     - Key takeaways
     """
 
+    __slots__ = ("llm_client",)
+
     def __init__(self, llm_client=None):
         """
         Initialize the summary agent.
@@ -58,7 +60,7 @@ class SummaryAgent(BaseAgent):
             )
 
         except Exception as e:
-            logger.exception(f"Error in {self.name}")
+            logger.exception("Error in %s", self.name)
             return AgentResult(
                 agent_name=self.name,
                 status=AgentStatus.FAILED,
@@ -86,29 +88,32 @@ class SummaryAgent(BaseAgent):
         # STEP 1: EXTRACT KEY FINANCIAL METRICS
         # ============================================================
         # Pull important financial indicators with sensible defaults if missing
-        revenue = financial_data.get("revenue", {}).get("value", "N/A")
-        revenue_yoy = financial_data.get("revenue", {}).get("yoy_change", 0)
-        net_income = financial_data.get("net_income", {}).get("value", "N/A")
-        net_income_yoy = financial_data.get("net_income", {}).get("yoy_change", 0)
+        revenue_data = financial_data.get("revenue", {})
+        net_income_data = financial_data.get("net_income", {})
+        revenue = revenue_data.get("value", "N/A")
+        revenue_yoy = revenue_data.get("yoy_change", 0)
+        net_income = net_income_data.get("value", "N/A")
+        net_income_yoy = net_income_data.get("yoy_change", 0)
         operating_margin = financial_data.get("operating_margin", {}).get("current", 0)
 
         # Debug logging for troubleshooting
-        logger.info(f"Summary agent - revenue_yoy={revenue_yoy}, operating_margin={operating_margin}")
+        logger.info("Summary agent - revenue_yoy=%s, operating_margin=%s", revenue_yoy, operating_margin)
 
         # ============================================================
         # STEP 2: EXTRACT SENTIMENT ANALYSIS RESULTS
         # ============================================================
         # Get overall sentiment tone and confidence from sentiment analysis agent
         overall_sentiment = sentiment_data.get("overall_sentiment", "neutral")
-        logger.info(f"Summary agent - overall_sentiment={overall_sentiment}, revenue={revenue}, net_income={net_income}")
+        logger.info("Summary agent - overall_sentiment=%s, revenue=%s, net_income=%s", overall_sentiment, revenue, net_income)
 
         # ============================================================
         # STEP 3: EXTRACT SEGMENT PERFORMANCE
         # ============================================================
         # Get segment-specific data (cloud, software, hardware) to understand growth drivers
         segment_perf = input_data.get("segment_performance", financial_data.get("segment_performance", {}))
-        cloud_revenue = segment_perf.get("cloud_services", {}).get("revenue", "N/A") if isinstance(segment_perf, dict) else "N/A"
-        cloud_growth = segment_perf.get("cloud_services", {}).get("growth_rate", 0) if isinstance(segment_perf, dict) else 0
+        cloud_data = segment_perf.get("cloud_services", {}) if isinstance(segment_perf, dict) else {}
+        cloud_revenue = cloud_data.get("revenue", "N/A")
+        cloud_growth = cloud_data.get("growth_rate", 0)
 
         # Extract sentiment confidence score (0.0 to 1.0)
         # Higher scores indicate higher confidence in the sentiment assessment
@@ -1,31 +1,140 @@
 """Anthropic LLM Client for agent interactions"""
 
 import os
+import time
+import asyncio
 import logging
-from typing import Dict, Any, Optional
+from typing import Dict, Any, AsyncIterator, Final, Optional, List
 import json
 
+import httpx
+import orjson
+
+from .cache import TTLCache, content_hash
+
 try:
-    from anthropic import Anthropic, AsyncAnthropic
+    from anthropic import AsyncAnthropic, DefaultAsyncHttpxClient
 except ImportError:
-    Anthropic = None
     AsyncAnthropic = None
+    DefaultAsyncHttpxClient = None
+
+try:
+    import h2  # noqa: F401 - enables HTTP/2 in httpx
+    HTTP2_AVAILABLE = True
+except ImportError:
+    HTTP2_AVAILABLE = False
 
 logger = logging.getLogger(__name__)
 
+# Static system prompt shared by every agent call. It is sent as a block marked for
+# prompt caching, but it is shorter than the minimum cacheable prefix, so the
+# provider will not cache it until the prompt grows past that length.
+DEFAULT_SYSTEM_PROMPT: Final[str] = """You are an expert financial analyst specializing in earnings reports analysis.
+Your role is to:
+1. Extract key financial metrics accurately
+2. Analyze sentiment and tone in management commentary
+3. Identify risks and opportunities
+4. Provide clear, structured insights
+
+Always respond with clear, factual analysis based on the provided data.
+Format structured data as JSON when requested.
+Be precise with numbers and percentages.
+Highlight important context and trends."""
+
+# Prebuilt system block for the default prompt, marked as a prompt-cache breakpoint
+_DEFAULT_SYSTEM_BLOCKS = [{
+    "type": "text",
+    "text": DEFAULT_SYSTEM_PROMPT,
+    "cache_control": {"type": "ephemeral"}
+}]
+
+
+def parse_json_object(text: str) -> Optional[Dict[str, Any]]:
+    """
+    Parse the first JSON object embedded in free-form text.
+
+    Scans forward from each '{' with JSONDecoder.raw_decode, which is linear in the
+    object size and tolerates prose or trailing braces around the object.
+
+    Args:
+        text: Text that may contain a JSON object
+
+    Returns:
+        The decoded object, or None if no valid object is found
+    """
+    # Replies that are exactly one object, as the prompts request, take one orjson call
+    stripped = text.strip()
+    if stripped.startswith("{") and stripped.endswith("}"):
+        try:
+            value = orjson.loads(stripped)
+            if isinstance(value, dict):
+                return value
+        except orjson.JSONDecodeError:
+            pass
+
+    decoder = json.JSONDecoder()
+    start = text.find("{")
+    while start != -1:
+        try:
+            value, _ = decoder.raw_decode(text, start)
+            if isinstance(value, dict):
+                return value
+        except ValueError:
+            pass
+        start = text.find("{", start + 1)
+    return None
+
+
+class _RateLimiter:
+    """Token bucket that limits how many requests may start per minute"""
+
+    def __init__(self, requests_per_minute: int):
+        self.capacity = float(requests_per_minute)
+        self.tokens = float(requests_per_minute)
+        self.refill_rate = requests_per_minute / 60.0
+        self.updated_at = time.monotonic()
+        self._lock = asyncio.Lock()
+
+    async def acquire(self) -> None:
+        """Wait until a request slot is available and consume it"""
+        async with self._lock:
+            while True:
+                now = time.monotonic()
+                self.tokens = min(self.capacity, self.tokens + (now - self.updated_at) * self.refill_rate)
+                self.updated_at = now
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return
+                await asyncio.sleep((1 - self.tokens) / self.refill_rate)
+
 
 class AnthropicLLMClient:
     """
     Client for interacting with Anthropic's Claude models.
+
+    All agents share one instance, so concurrent requests are bounded by a
+    semaphore and a per-minute rate limit over a single pooled HTTP client.
     """
 
-    def __init__(self, model: str = "claude-sonnet-4-5-20250929", api_key: Optional[str] = None):
+    def __init__(
+        self,
+        model: str = "claude-sonnet-4-5-20250929",
+        api_key: Optional[str] = None,
+        max_concurrency: int = 40,
+        requests_per_minute: int = 50,
+        cache: Optional[TTLCache] = None,
+        max_retries: int = 3
+    ):
         """
         Initialize the Anthropic LLM client.
 
         Args:
             model: Model ID to use (defaults to claude-sonnet-4-5)
             api_key: Anthropic API key (defaults to ANTHROPIC_API_KEY env var)
+            max_concurrency: Maximum number of in-flight API requests
+            requests_per_minute: Maximum number of API requests started per minute
+            cache: Optional cache for deterministic (temperature 0) responses
+            max_retries: Retries with exponential backoff on rate limits, 5xx and connection errors
         """
         if AsyncAnthropic is None:
             raise ImportError("anthropic package not installed. Install with: pip install anthropic")
@@ -37,9 +146,51 @@ class AnthropicLLMClient:
             raise ValueError(
                 "ANTHROPIC_API_KEY not provided. Set it via parameter or environment variable."
             )
+        if max_concurrency < 1:
+            raise ValueError(f"max_concurrency must be at least 1, got {max_concurrency}")
+        if requests_per_minute < 1:
+            raise ValueError(f"requests_per_minute must be at least 1, got {requests_per_minute}")
+
+        # HTTP/2 multiplexes concurrent agent calls over a few long-lived connections
+        self.http_client = DefaultAsyncHttpxClient(
+            http2=HTTP2_AVAILABLE,
+            limits=httpx.Limits(max_connections=100, max_keepalive_connections=50)
+        )
+        self.client = AsyncAnthropic(
+            api_key=self.api_key,
+            http_client=self.http_client,
+            max_retries=max_retries
+        )
+        self._semaphore = asyncio.Semaphore(max_concurrency)
+        self._rate_limiter = _RateLimiter(requests_per_minute)
+        self.cache = cache
+        logger.info("Initialized Anthropic LLM client with model: %s", model)
+
+    async def _create_message(self, system: Optional[str] = None, **kwargs: Any) -> Any:
+        """
+        Send a Messages API request within the client's concurrency and rate limits.
+
+        Args:
+            system: Optional system prompt (defaults to the financial-analyst prompt)
+            kwargs: Additional messages.create arguments
+
+        Returns:
+            The SDK response message
+        """
+        async with self._semaphore:
+            await self._rate_limiter.acquire()
+            return await self.client.messages.create(
+                model=self.model,
+                system=self._system_blocks(system),
+                **kwargs
+            )
 
-        self.client = AsyncAnthropic(api_key=self.api_key)
-        logger.info(f"Initialized Anthropic LLM client with model: {model}")
+    @staticmethod
+    def _system_blocks(system: Optional[str]) -> List[Dict[str, Any]]:
+        """Build the cacheable system prompt blocks for a request"""
+        if system is None:
+            return _DEFAULT_SYSTEM_BLOCKS
+        return [{"type": "text", "text": system, "cache_control": {"type": "ephemeral"}}]
 
     async def generate(
         self,
@@ -60,26 +211,85 @@ class AnthropicLLMClient:
         Returns:
             Generated text response
         """
+        # Only temperature 0 output is reproducible enough to serve from cache
+        cache_key = None
+        if self.cache is not None and temperature == 0:
+            cache_key = content_hash(self.model, system or "", prompt, str(max_tokens))
+            cached = self.cache.get(cache_key)
+            if cached is not None:
+                logger.debug("Serving LLM response from cache")
+                return cached
+
         try:
             messages = [{"role": "user", "content": prompt}]
 
-            response = await self.client.messages.create(
-                model=self.model,
+            response = await self._create_message(
                 max_tokens=max_tokens,
                 temperature=temperature,
-                system=system or self._get_default_system_prompt(),
+                system=system,
                 messages=messages
             )
 
             # Extract text from response
             text = response.content[0].text if response.content else ""
-            logger.debug(f"Generated {len(text)} characters of text")
+            logger.debug("Generated %d characters of text", len(text))
+
+            if cache_key is not None:
+                self.cache.set(cache_key, text)
             return text
 
         except Exception as e:
-            logger.error(f"Error generating text: {str(e)}")
+            logger.error("Error generating text: %s", e)
             raise
 
+    async def stream(
+        self,
+        prompt: str,
+        temperature: float = 0.7,
+        max_tokens: int = 1024,
+        system: Optional[str] = None
+    ) -> AsyncIterator[str]:
+        """
+        Stream generated text as Claude produces it.
+
+        The request holds a concurrency slot until the stream is exhausted or closed.
+
+        Args:
+            prompt: The input prompt
+            temperature: Sampling temperature (0-1)
+            max_tokens: Maximum tokens in response
+            system: Optional system prompt
+
+        Yields:
+            Text deltas in generation order
+        """
+        async with self._semaphore:
+            await self._rate_limiter.acquire()
+            async with self.client.messages.stream(
+                model=self.model,
+                system=self._system_blocks(system),
+                max_tokens=max_tokens,
+                temperature=temperature,
+                messages=[{"role": "user", "content": prompt}]
+            ) as response:
+                async for text in response.text_stream:
+                    yield text
+
+    async def generate_many(self, prompts: List[str], **kwargs: Any) -> List[str]:
+        """
+        Generate responses for several independent prompts concurrently.
+
+        Requests still pass through the client's concurrency and rate limits.
+
+        Args:
+            prompts: Input prompts
+            kwargs: Arguments forwarded to generate()
+
+        Returns:
+            Generated text responses, in prompt order
+        """
+        return list(await asyncio.gather(*(self.generate(prompt, **kwargs) for prompt in prompts)))
+
     async def extract_json(
         self,
         text: str,
@@ -89,6 +299,9 @@ class AnthropicLLMClient:
         """
         Extract structured data (JSON) from text.
 
+        Uses a forced tool call so Claude returns the data as parsed tool input
+        rather than free text that has to be located and decoded.
+
         Args:
             text: Text to extract from
             schema: Expected JSON schema
@@ -98,63 +311,121 @@ class AnthropicLLMClient:
             Extracted JSON data
         """
         try:
-            prompt = f"""Extract structured data from the following text. Return only valid JSON matching this schema:
-
-Schema: {json.dumps(schema)}
-
-Text:
-{text}
-
-Return ONLY the JSON object, no additional text."""
-
-            response = await self.generate(
-                prompt=prompt,
+            # Tool input must be an object schema; looser schemas are described instead
+            input_schema = schema if schema.get("type") == "object" else {"type": "object"}
+            tool = {
+                "name": "record_extraction",
+                "description": f"Record the structured data extracted from the text. Schema: {orjson.dumps(schema).decode()}",
+                "input_schema": input_schema
+            }
+
+            response = await self._create_message(
+                max_tokens=1000,
                 temperature=temperature,
-                max_tokens=1000
+                tools=[tool],
+                tool_choice={"type": "tool", "name": tool["name"]},
+                messages=[{
+                    "role": "user",
+                    "content": f"Extract structured data from the following text.\n\nText:\n{text}"
+                }]
             )
 
-            # Parse JSON response
-            import re
-            json_match = re.search(r'\{[\s\S]*\}', response)
-            if json_match:
-                return json.loads(json_match.group())
+            for block in response.content:
+                if block.type == "tool_use":
+                    return block.input
+
+            # Fall back to any JSON object in a text reply
+            for block in response.content:
+                if block.type == "text":
+                    data = parse_json_object(block.text)
+                    if data is not None:
+                        return data
 
             logger.warning("Could not extract JSON from response")
             return {}
 
         except Exception as e:
-            logger.error(f"Error extracting JSON: {str(e)}")
+            logger.error("Error extracting JSON: %s", e)
             return {}
 
-    def _get_default_system_prompt(self) -> str:
-        """Get default system prompt for financial analysis"""
-        return """You are an expert financial analyst specializing in earnings reports analysis.
-Your role is to:
-1. Extract key financial metrics accurately
-2. Analyze sentiment and tone in management commentary
-3. Identify risks and opportunities
-4. Provide clear, structured insights
+    async def warmup(self, timeout: float = 5.0) -> None:
+        """
+        Send a minimal request so the first real call finds a warm connection.
 
-Always respond with clear, factual analysis based on the provided data.
-Format structured data as JSON when requested.
-Be precise with numbers and percentages.
-Highlight important context and trends."""
+        Failures and timeouts are logged and ignored; startup must not depend on the API.
+
+        Args:
+            timeout: Seconds to wait for the request, including SDK retries
+        """
+        try:
+            await asyncio.wait_for(
+                self._create_message(
+                    max_tokens=1,
+                    messages=[{"role": "user", "content": "ping"}]
+                ),
+                timeout
+            )
+            logger.info("LLM client warmed up")
+        except asyncio.TimeoutError:
+            logger.warning("LLM warmup timed out after %.1fs", timeout)
+        except Exception as e:
+            logger.warning("LLM warmup failed: %s", e)
+
+    async def aclose(self) -> None:
+        """Close the underlying HTTP connection pool"""
+        await self.client.close()
 
-    def health_check(self) -> bool:
+    async def health_check(self) -> bool:
         """Check if the client is properly configured"""
         try:
-            # Try a simple message to verify connectivity
-            response = self.client.messages.create(
-                model=self.model,
+            # Try a simple message to verify connectivity, within the shared limits
+            response = await self._create_message(
                 max_tokens=10,
                 messages=[{"role": "user", "content": "ok"}]
             )
             return bool(response)
         except Exception as e:
-            logger.error(f"Health check failed: {str(e)}")
+            logger.error("Health check failed: %s", e)
             return False
 
 
+# Canned MockLLMClient responses, serialized once at import
+_MOCK_FINANCIAL_RESPONSE = json.dumps({
+    "financial_metrics": {
+        "revenue": {"value": 15.2, "unit": "billion USD", "yoy_change": 0.12},
+        "net_income": {"value": 3.8, "unit": "billion USD", "yoy_change": 0.18},
+        "eps": {"value": 4.52, "analyst_estimate": 4.30, "beat_estimate": True},
+        "operating_margin": {"current": 0.285, "previous": 0.262}
+    },
+    "segment_performance": {
+        "cloud_services": {"revenue": 6.8, "growth_rate": 0.35}
+    },
+    "forward_guidance": {
+        "q4_2024": {"revenue_range": [16.0, 16.5]}
+    }
+})
+
+_MOCK_SENTIMENT_RESPONSE = json.dumps({
+    "overall_sentiment": "positive",
+    "confidence": 0.85,
+    "management_tone": "optimistic_cautious",
+    "key_positive_indicators": [
+        "exceeded expectations",
+        "remarkable cloud growth",
+        "strong cash generation"
+    ],
+    "key_negative_indicators": [
+        "hardware decline",
+        "competition increasing"
+    ],
+    "risk_factors_identified": [
+        "market competition",
+        "regulatory scrutiny",
+        "economic uncertainty"
+    ]
+})
+
+
 class MockLLMClient:
     """
     Mock LLM client for testing without API calls.
@@ -173,44 +444,22 @@ class MockLLMClient:
     ) -> str:
         """Generate mock response"""
         # Return structured mock data based on prompt
-        if "financial" in prompt.lower() or "metric" in prompt.lower():
-            return json.dumps({
-                "financial_metrics": {
-                    "revenue": {"value": 15.2, "unit": "billion USD", "yoy_change": 0.12},
-                    "net_income": {"value": 3.8, "unit": "billion USD", "yoy_change": 0.18},
-                    "eps": {"value": 4.52, "analyst_estimate": 4.30, "beat_estimate": True},
-                    "operating_margin": {"current": 0.285, "previous": 0.262}
-                },
-                "segment_performance": {
-                    "cloud_services": {"revenue": 6.8, "growth_rate": 0.35}
-                },
-                "forward_guidance": {
-                    "q4_2024": {"revenue_range": [16.0, 16.5]}
-                }
-            })
-        elif "sentiment" in prompt.lower():
-            return json.dumps({
-                "overall_sentiment": "positive",
-                "confidence": 0.85,
-                "management_tone": "optimistic_cautious",
-                "key_positive_indicators": [
-                    "exceeded expectations",
-                    "remarkable cloud growth",
-                    "strong cash generation"
-                ],
-                "key_negative_indicators": [
-                    "hardware decline",
-                    "competition increasing"
-                ],
-                "risk_factors_identified": [
-                    "market competition",
-                    "regulatory scrutiny",
-                    "economic uncertainty"
-                ]
-            })
+        prompt_lower = prompt.lower()
+        if "financial" in prompt_lower or "metric" in prompt_lower:
+            return _MOCK_FINANCIAL_RESPONSE
+        elif "sentiment" in prompt_lower:
+            return _MOCK_SENTIMENT_RESPONSE
         else:
             return "Mock LLM response"
 
+    async def stream(self, prompt: str, **kwargs: Any) -> AsyncIterator[str]:
+        """Stream the mock response as a single chunk"""
+        yield await self.generate(prompt, **kwargs)
+
+    async def generate_many(self, prompts: List[str], **kwargs: Any) -> List[str]:
+        """Generate mock responses for several prompts"""
+        return list(await asyncio.gather(*(self.generate(prompt, **kwargs) for prompt in prompts)))
+
     async def extract_json(
         self,
         text: str,
@@ -220,6 +469,12 @@ class MockLLMClient:
         """Extract mock JSON"""
         return {"mock": "data"}
 
-    def health_check(self) -> bool:
+    async def warmup(self, timeout: float = 5.0) -> None:
+        """Mock warmup"""
+
+    async def aclose(self) -> None:
+        """Mock close"""
+
+    async def health_check(self) -> bool:
         """Mock health check"""
         return True
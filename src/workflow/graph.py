@@ -1,7 +1,8 @@
 """LangGraph workflow orchestration for multi-agent earnings analysis"""
 
-from typing import Dict, Any, TypedDict, Optional
+from typing import Dict, Any, TypedDict, Optional, Annotated, AsyncIterator
 from langgraph.graph import StateGraph, END
+import operator
 import logging
 
 logger = logging.getLogger(__name__)
@@ -10,6 +11,8 @@ logger = logging.getLogger(__name__)
 class AnalysisState(TypedDict):
     """State schema for the earnings analysis workflow"""
     report_content: str
+    # Lowercased once here so agents doing case-insensitive matching share one copy
+    report_content_lower: str
     report_metadata: Optional[Dict[str, Any]]
     financial_metrics: Dict[str, Any]
     segment_performance: Dict[str, Any]
@@ -17,7 +20,8 @@ class AnalysisState(TypedDict):
     sentiment_analysis: Dict[str, Any]
     executive_summary: Dict[str, Any]
     metadata: Dict[str, Any]
-    errors: list
+    # Reducer lets the parallel extraction/sentiment branches both append errors
+    errors: Annotated[list, operator.add]
 
 
 class WorkflowGraph:
@@ -61,28 +65,33 @@ class WorkflowGraph:
         workflow.set_entry_point("coordinator")
 
         # Define edges
+        # Data extraction and sentiment analysis only read report_content and write
+        # disjoint keys, so fan them out in parallel and join at summary generation
         workflow.add_edge("coordinator", "data_extraction")
-        workflow.add_edge("data_extraction", "sentiment_analysis")
-        workflow.add_edge("sentiment_analysis", "summary_generation")
+        workflow.add_edge("coordinator", "sentiment_analysis")
+        workflow.add_edge(["data_extraction", "sentiment_analysis"], "summary_generation")
         workflow.add_edge("summary_generation", END)
 
         logger.info("LangGraph workflow graph constructed successfully")
         return workflow
 
-    async def _coordinator_node(self, state: AnalysisState) -> AnalysisState:
+    async def _coordinator_node(self, state: AnalysisState) -> Dict[str, Any]:
         """
         Coordinator node that validates and initializes the workflow.
         """
         logger.info("Coordinator node executing")
-        state["metadata"] = {
-            "status": "initialized",
-            "agents": ["coordinator", "data_extractor", "sentiment_analyzer", "summary_generator"]
+        return {
+            "metadata": {
+                "status": "initialized",
+                "agents": ["coordinator", "data_extractor", "sentiment_analyzer", "summary_generator"]
+            }
         }
-        return state
 
-    async def _data_extraction_node(self, state: AnalysisState) -> AnalysisState:
+    async def _data_extraction_node(self, state: AnalysisState) -> Dict[str, Any]:
         """
         Data extraction node that processes financial metrics.
+
+        Runs in parallel with sentiment analysis, so only the keys it owns are returned.
         """
         logger.info("Data extraction node executing")
         try:
@@ -92,23 +101,25 @@ class WorkflowGraph:
             )
 
             if result.status.value == "success":
-                state["financial_metrics"] = result.data.get("financial_metrics", {})
-                state["segment_performance"] = result.data.get("segment_performance", {})
-                state["forward_guidance"] = result.data.get("forward_guidance", {})
                 logger.info("Data extraction completed successfully")
-            else:
-                state["errors"].append(f"Data extraction failed: {result.errors}")
-                logger.error(f"Data extraction failed: {result.errors}")
+                return {
+                    "financial_metrics": result.data.get("financial_metrics", {}),
+                    "segment_performance": result.data.get("segment_performance", {}),
+                    "forward_guidance": result.data.get("forward_guidance", {})
+                }
+
+            logger.error(f"Data extraction failed: {result.errors}")
+            return {"errors": [f"Data extraction failed: {result.errors}"]}
 
         except Exception as e:
-            state["errors"].append(f"Data extraction error: {str(e)}")
             logger.error(f"Data extraction error: {str(e)}")
+            return {"errors": [f"Data extraction error: {str(e)}"]}
 
-        return state
-
-    async def _sentiment_analysis_node(self, state: AnalysisState) -> AnalysisState:
+    async def _sentiment_analysis_node(self, state: AnalysisState) -> Dict[str, Any]:
         """
         Sentiment analysis node that analyzes management tone and risk factors.
+
+        Runs in parallel with data extraction, so only the keys it owns are returned.
         """
         logger.info("Sentiment analysis node executing")
         try:
@@ -118,19 +129,17 @@ class WorkflowGraph:
             )
 
             if result.status.value == "success":
-                state["sentiment_analysis"] = result.data
                 logger.info("Sentiment analysis completed successfully")
-            else:
-                state["errors"].append(f"Sentiment analysis failed: {result.errors}")
-                logger.error(f"Sentiment analysis failed: {result.errors}")
+                return {"sentiment_analysis": result.data}
+
+            logger.error(f"Sentiment analysis failed: {result.errors}")
+            return {"errors": [f"Sentiment analysis failed: {result.errors}"]}
 
         except Exception as e:
-            state["errors"].append(f"Sentiment analysis error: {str(e)}")
             logger.error(f"Sentiment analysis error: {str(e)}")
+            return {"errors": [f"Sentiment analysis error: {str(e)}"]}
 
-        return state
-
-    async def _summary_generation_node(self, state: AnalysisState) -> AnalysisState:
+    async def _summary_generation_node(self, state: AnalysisState) -> Dict[str, Any]:
         """
         Summary node that consolidates all findings.
         """
@@ -147,19 +156,32 @@ class WorkflowGraph:
             result = await self.summary.process(summary_input, state)
 
             if result.status.value == "success":
-                state["executive_summary"] = result.data
                 logger.info("Summary generation completed successfully")
-            else:
-                state["errors"].append(f"Summary generation failed: {result.errors}")
-                logger.error(f"Summary generation failed: {result.errors}")
+                return {"executive_summary": result.data}
+
+            logger.error(f"Summary generation failed: {result.errors}")
+            return {"errors": [f"Summary generation failed: {result.errors}"]}
 
         except Exception as e:
-            state["errors"].append(f"Summary generation error: {str(e)}")
             logger.error(f"Summary generation error: {str(e)}")
+            return {"errors": [f"Summary generation error: {str(e)}"]}
 
-        return state
+    def _initial_state(self, report_content: str, options: Optional[Dict[str, Any]]) -> AnalysisState:
+        """Build the initial workflow state for a report"""
+        return {
+            "report_content": report_content,
+            "report_content_lower": report_content.lower(),
+            "report_metadata": options or {},
+            "financial_metrics": {},
+            "segment_performance": {},
+            "forward_guidance": {},
+            "sentiment_analysis": {},
+            "executive_summary": {},
+            "metadata": {},
+            "errors": []
+        }
 
-    async def invoke(self, report_content: str, options: Dict[str, Any] = None) -> Dict[str, Any]:
+    async def invoke(self, report_content: str, options: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
         """
         Invoke the workflow with a report.
 
@@ -172,18 +194,7 @@ class WorkflowGraph:
         """
         logger.info("Invoking workflow with report")
 
-        # Initialize state
-        state: AnalysisState = {
-            "report_content": report_content,
-            "report_metadata": options or {},
-            "financial_metrics": {},
-            "segment_performance": {},
-            "forward_guidance": {},
-            "sentiment_analysis": {},
-            "executive_summary": {},
-            "metadata": {},
-            "errors": []
-        }
+        state = self._initial_state(report_content, options)
 
         # Execute compiled graph
         try:
@@ -194,3 +205,27 @@ class WorkflowGraph:
             logger.error(f"Workflow execution failed: {str(e)}")
             state["errors"].append(f"Workflow execution failed: {str(e)}")
             return state
+
+    async def astream(self, report_content: str, options: Optional[Dict[str, Any]] = None) -> AsyncIterator[Dict[str, Any]]:
+        """
+        Run the workflow, yielding each node's output as soon as it finishes.
+
+        Args:
+            report_content: The earnings report text
+            options: Optional configuration options
+
+        Yields:
+            Dictionaries of the form {"stage": node_name, "data": state_update}
+        """
+        logger.info("Streaming workflow with report")
+
+        state = self._initial_state(report_content, options)
+
+        try:
+            async for update in self.compiled_graph.astream(state, stream_mode="updates"):
+                for stage, data in update.items():
+                    yield {"stage": stage, "data": data or {}}
+            logger.info("Workflow streaming completed")
+        except Exception as e:
+            logger.error(f"Workflow execution failed: {str(e)}")
+            yield {"stage": "error", "data": {"errors": [f"Workflow execution failed: {str(e)}"]}}
@@ -8,9 +8,10 @@ import pytest
 import sys
 from pathlib import Path
 
-# Add the project root to the Python path
+# Add the project root to the Python path unless it is already importable
 project_root = Path(__file__).parent.parent
-sys.path.insert(0, str(project_root))
+if str(project_root) not in sys.path:
+    sys.path.insert(0, str(project_root))
 
 
 @pytest.fixture(scope="session")
@@ -9,14 +9,19 @@ This test suite validates:
 """
 
 import pytest
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from src.agents.base import BaseAgent, AgentStatus, AgentResult, ExampleAgent
+from src.agents.coordinator import CoordinatorAgent, MMAP_MIN_SIZE, read_report_file
+from src.agents.data_extractor import DataExtractorAgent
+from src.agents.sentiment import SentimentAnalysisAgent
+from src.llm_client import MockLLMClient
 
 
 class TestBaseAgent:
     """Test suite for the BaseAgent class"""
 
-    @pytest.mark.asyncio
-    async def test_example_agent_initialization(self):
+    def test_example_agent_initialization(self):
         """Test that example agent initializes correctly"""
         agent = ExampleAgent()
         assert agent.name == "example_agent"
@@ -24,8 +29,7 @@ class TestBaseAgent:
         assert isinstance(agent.state, dict)
         assert len(agent.state) == 0
 
-    @pytest.mark.asyncio
-    async def test_example_agent_state_management(self):
+    def test_example_agent_state_management(self):
         """Test agent state update and retrieval"""
         agent = ExampleAgent()
 
@@ -36,8 +40,7 @@ class TestBaseAgent:
         # Test state default value
         assert agent.get_state("nonexistent", "default") == "default"
 
-    @pytest.mark.asyncio
-    async def test_example_agent_reset(self):
+    def test_example_agent_reset(self):
         """Test agent reset functionality"""
         agent = ExampleAgent()
 
@@ -50,24 +53,17 @@ class TestBaseAgent:
         assert agent.status == AgentStatus.READY
         assert len(agent.state) == 0
 
-    @pytest.mark.asyncio
-    async def test_example_agent_validate_input_valid(self):
+    def test_example_agent_validate_input_valid(self):
         """Test input validation with valid data"""
         agent = ExampleAgent()
         valid_input = {"key": "value"}
         assert agent.validate_input(valid_input) is True
 
-    @pytest.mark.asyncio
-    async def test_example_agent_validate_input_invalid(self):
-        """Test input validation with invalid data"""
+    @pytest.mark.parametrize("bad_input", [None, "not a dict", [1, 2, 3]])
+    def test_example_agent_validate_input_invalid(self, bad_input):
+        """Test input validation rejects None and non-dict inputs"""
         agent = ExampleAgent()
-
-        # Test None input
-        assert agent.validate_input(None) is False
-
-        # Test non-dict input
-        assert agent.validate_input("not a dict") is False
-        assert agent.validate_input([1, 2, 3]) is False
+        assert agent.validate_input(bad_input) is False
 
     @pytest.mark.asyncio
     async def test_example_agent_process_success(self):
@@ -98,7 +94,31 @@ class TestBaseAgent:
         assert len(result.errors) > 0
 
     @pytest.mark.asyncio
-    async def test_agent_repr(self):
+    async def test_run_cpu_bound_offloads_only_large_inputs(self):
+        """Test that only inputs over the threshold run in the executor"""
+        agent = ExampleAgent()
+        agent.offload_min_size = 10
+        caller = threading.get_ident()
+
+        with ThreadPoolExecutor(max_workers=1) as executor:
+            agent.executor = executor
+            small = await agent.run_cpu_bound(threading.get_ident, input_size=5)
+            large = await agent.run_cpu_bound(threading.get_ident, input_size=50)
+
+        assert small == caller
+        assert large != caller
+
+    @pytest.mark.asyncio
+    async def test_process_many_isolates_failures(self):
+        """Test that batch processing keeps order and per-input failures"""
+        agent = ExampleAgent()
+
+        results = await agent.process_many([{"a": 1}, None, {"b": 2}], {})
+
+        assert [r.status for r in results] == [AgentStatus.SUCCESS, AgentStatus.FAILED, AgentStatus.SUCCESS]
+        assert results[2].data["input"] == {"b": 2}
+
+    def test_agent_repr(self):
         """Test agent string representation"""
         agent = ExampleAgent()
         repr_str = repr(agent)
@@ -107,6 +127,127 @@ class TestBaseAgent:
         assert "ready" in repr_str
 
 
+class TestDataExtractorAgent:
+    """Test suite for DataExtractorAgent"""
+
+    @pytest.mark.asyncio
+    async def test_repeated_report_uses_extraction_cache(self):
+        """Test that an identical report is served from cache as an independent copy"""
+        agent = DataExtractorAgent()
+        context = {"report_content": "Revenue: $15.2 billion, YoY: 12%"}
+
+        first = await agent.process({}, context)
+        first.data["financial_metrics"]["revenue"]["value"] = 0
+        second = await agent.process({}, context)
+
+        assert agent.extraction_cache.stats()["hits"] == 1
+        assert second.data["financial_metrics"]["revenue"]["value"] == 15.2
+
+
+class TestSentimentAnalysisAgent:
+    """Test suite for SentimentAnalysisAgent"""
+
+    @pytest.mark.asyncio
+    async def test_repeated_report_uses_analysis_cache(self):
+        """Test that an identical report's keyword analysis is served from cache as an independent copy"""
+        agent = SentimentAnalysisAgent()
+        context = {"report_content": "Strong growth exceeded expectations despite hardware decline"}
+
+        first = await agent.process({}, context)
+        first.data["risk_factors_identified"].clear()
+        second = await agent.process({}, context)
+
+        assert agent.analysis_cache.stats()["hits"] == 1
+        assert second.data["overall_sentiment"] == "positive"
+        assert second.data["risk_factors_identified"]
+
+    @pytest.mark.asyncio
+    async def test_repeated_report_reuses_llm_analysis(self):
+        """Test that an identical report excerpt is sent to the LLM only once"""
+        llm_client = MockLLMClient()
+        calls = []
+        generate = llm_client.generate
+
+        async def counting_generate(*args, **kwargs):
+            calls.append(kwargs)
+            return await generate(*args, **kwargs)
+
+        llm_client.generate = counting_generate
+        agent = SentimentAnalysisAgent(llm_client=llm_client)
+        context = {"report_content": "Strong growth exceeded expectations"}
+
+        first = await agent.process({}, context)
+        second = await agent.process({}, context)
+
+        assert len(calls) == 1
+        assert agent.llm_analysis_cache.stats()["hits"] == 1
+        assert second.data == first.data
+        assert second.data is not first.data
+
+    @pytest.mark.asyncio
+    async def test_llm_stream_stops_after_json_object(self):
+        """Test that the LLM reply stream is closed once the JSON object is complete"""
+        class ChunkedLLMClient:
+            closed_after = None
+
+            async def stream(self, prompt, **kwargs):
+                chunks = ['Here: {"overall_sentiment": "pos', 'itive", "confidence": 0.9}', " and more", " text"]
+                sent = 0
+                try:
+                    for chunk in chunks:
+                        sent += 1
+                        yield chunk
+                finally:
+                    ChunkedLLMClient.closed_after = sent
+
+        agent = SentimentAnalysisAgent(llm_client=ChunkedLLMClient())
+        result = await agent.process({}, {"report_content": "Strong growth"})
+
+        assert result.data["overall_sentiment"] == "positive"
+        assert result.data["confidence"] == 0.9
+        assert ChunkedLLMClient.closed_after == 2
+
+
+class TestReadReportFile:
+    """Test suite for the coordinator's report file reader"""
+
+    @pytest.mark.parametrize("size", [100, MMAP_MIN_SIZE * 2])
+    def test_matches_text_mode_read(self, tmp_path, size):
+        """Test that buffered and memory-mapped reads match a text-mode read"""
+        report = tmp_path / "report.txt"
+        line = "Revenue: $15.2 billion \u2014 up 12%\r\n"
+        report.write_bytes((line * (size // len(line) + 1)).encode("utf-8"))
+
+        with open(report, encoding="utf-8") as f:
+            expected = f.read()
+
+        assert read_report_file(str(report)) == expected
+
+
+class TestCoordinatorAgent:
+    """Test suite for CoordinatorAgent"""
+
+    @pytest.mark.asyncio
+    async def test_reads_report_path_into_context(self, tmp_path):
+        """Test that a report_path input is read and shared through the context"""
+        report = tmp_path / "report.txt"
+        report.write_text("Revenue: $15.2 billion", encoding="utf-8")
+        context = {}
+
+        result = await CoordinatorAgent().process({"report_path": str(report)}, context)
+
+        assert result.status == AgentStatus.SUCCESS
+        assert context["report_content"] == "Revenue: $15.2 billion"
+
+    @pytest.mark.asyncio
+    async def test_missing_report_path_fails(self, tmp_path):
+        """Test that an unreadable report_path returns a failed result"""
+        result = await CoordinatorAgent().process({"report_path": str(tmp_path / "missing.txt")}, {})
+
+        assert result.status == AgentStatus.FAILED
+        assert "Failed to read report file" in result.errors[0]
+
+
 class TestAgentStatus:
     """Test suite for AgentStatus enum"""
 
@@ -149,3 +290,11 @@ class TestAgentResult:
         assert result.status == AgentStatus.FAILED
         assert len(result.errors) == 2
         assert "Error message 1" in result.errors
+
+    def test_agent_result_has_no_instance_dict(self):
+        """Test that AgentResult uses slots and rejects unknown attributes"""
+        result = AgentResult(agent_name="test_agent", status=AgentStatus.SUCCESS, data={})
+
+        assert not hasattr(result, "__dict__")
+        with pytest.raises(AttributeError):
+            result.unknown = True
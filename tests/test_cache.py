@@ -0,0 +1,53 @@
+"""
+Tests for the in-process cache utilities.
+
+This test suite validates:
+- Content hashing stability
+- LRU eviction
+- TTL expiry
+"""
+
+from src.cache import TTLCache, content_hash
+
+
+class TestContentHash:
+    """Test suite for content_hash"""
+
+    def test_same_inputs_same_hash(self):
+        """Test that hashing is deterministic and ignores dict key order"""
+        assert content_hash("report", {"a": 1, "b": 2}) == content_hash("report", {"b": 2, "a": 1})
+
+    def test_part_boundaries_matter(self):
+        """Test that concatenation ambiguity does not collide"""
+        assert content_hash("ab", "c") != content_hash("a", "bc")
+
+
+class TestTTLCache:
+    """Test suite for TTLCache"""
+
+    def test_get_and_set(self):
+        """Test basic storage and default on miss"""
+        cache = TTLCache()
+        cache.set("key", {"value": 1})
+        assert cache.get("key") == {"value": 1}
+        assert cache.get("missing", "default") == "default"
+        assert "key" in cache
+
+    def test_evicts_least_recently_used(self):
+        """Test that the least recently used entry is evicted when full"""
+        cache = TTLCache(maxsize=2)
+        cache.set("a", 1)
+        cache.set("b", 2)
+        cache.get("a")
+        cache.set("c", 3)
+
+        assert "a" in cache
+        assert "b" not in cache
+        assert len(cache) == 2
+
+    def test_expired_entries_are_dropped(self):
+        """Test that entries past their TTL are not returned"""
+        cache = TTLCache(ttl_seconds=-1)
+        cache.set("key", "value")
+        assert cache.get("key") is None
+        assert len(cache) == 0
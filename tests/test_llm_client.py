@@ -0,0 +1,195 @@
+"""
+Tests for the LLM client wrappers.
+
+This test suite validates:
+- Deterministic response caching in AnthropicLLMClient
+- Tool-use JSON extraction and the JSON object parser
+- MockLLMClient behaviour
+"""
+
+import asyncio
+import pytest
+from types import SimpleNamespace
+from src.cache import TTLCache
+from src.llm_client import AnthropicLLMClient, MockLLMClient, parse_json_object
+
+
+class FakeMessages:
+    """Stand-in for the SDK messages resource that counts calls"""
+
+    def __init__(self, text, content=None):
+        self.text = text
+        self.content = content
+        self.calls = 0
+        self.last_kwargs = None
+
+    async def create(self, **kwargs):
+        self.calls += 1
+        self.last_kwargs = kwargs
+        content = self.content or [SimpleNamespace(type="text", text=self.text)]
+        return SimpleNamespace(content=content)
+
+    def stream(self, **kwargs):
+        self.calls += 1
+        self.last_kwargs = kwargs
+        return FakeStream(self.text.split(" "))
+
+
+class FakeStream:
+    """Stand-in for the SDK's async message stream manager"""
+
+    def __init__(self, chunks):
+        self.chunks = chunks
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc_info):
+        return False
+
+    @property
+    def text_stream(self):
+        return self._iter_text()
+
+    async def _iter_text(self):
+        for chunk in self.chunks:
+            yield chunk
+
+
+@pytest.fixture
+def anthropic_client():
+    """AnthropicLLMClient with a response cache and a faked API"""
+    client = AnthropicLLMClient(api_key="test-key", cache=TTLCache())
+    client.client = SimpleNamespace(messages=FakeMessages("cached answer"))
+    return client
+
+
+class TestAnthropicLLMClient:
+    """Test suite for AnthropicLLMClient"""
+
+    @pytest.mark.asyncio
+    async def test_deterministic_calls_are_cached(self, anthropic_client):
+        """Test that temperature 0 responses are served from cache"""
+        first = await anthropic_client.generate("prompt", temperature=0)
+        second = await anthropic_client.generate("prompt", temperature=0)
+
+        assert first == second == "cached answer"
+        assert anthropic_client.client.messages.calls == 1
+        assert anthropic_client.cache.stats()["hits"] == 1
+
+    @pytest.mark.asyncio
+    async def test_sampled_calls_are_not_cached(self, anthropic_client):
+        """Test that temperature > 0 always calls the API"""
+        await anthropic_client.generate("prompt", temperature=0.7)
+        await anthropic_client.generate("prompt", temperature=0.7)
+
+        assert anthropic_client.client.messages.calls == 2
+        assert len(anthropic_client.cache) == 0
+
+    @pytest.mark.asyncio
+    async def test_stream_yields_text_deltas(self, anthropic_client):
+        """Test that streaming yields each text delta with the cached system prompt"""
+        chunks = [chunk async for chunk in anthropic_client.stream("prompt")]
+
+        assert chunks == ["cached", "answer"]
+        kwargs = anthropic_client.client.messages.last_kwargs
+        assert kwargs["system"][0]["cache_control"] == {"type": "ephemeral"}
+
+    @pytest.mark.parametrize("limit", ["max_concurrency", "requests_per_minute"])
+    def test_rejects_non_positive_limits(self, limit):
+        """Test that a zero limit fails fast instead of deadlocking or dividing by zero"""
+        with pytest.raises(ValueError, match=limit):
+            AnthropicLLMClient(api_key="test-key", **{limit: 0})
+
+    @pytest.mark.asyncio
+    async def test_warmup_sends_minimal_request(self, anthropic_client):
+        """Test that warmup sends one token request with the default system prompt"""
+        await anthropic_client.warmup()
+
+        kwargs = anthropic_client.client.messages.last_kwargs
+        assert kwargs["max_tokens"] == 1
+        assert kwargs["system"][0]["cache_control"] == {"type": "ephemeral"}
+
+    @pytest.mark.asyncio
+    async def test_warmup_ignores_api_errors(self, anthropic_client):
+        """Test that a failed warmup does not raise"""
+        async def fail(**kwargs):
+            raise RuntimeError("unreachable")
+        anthropic_client.client.messages.create = fail
+
+        await anthropic_client.warmup()
+
+    @pytest.mark.asyncio
+    async def test_warmup_gives_up_after_timeout(self, anthropic_client):
+        """Test that a hanging warmup request is abandoned instead of blocking startup"""
+        async def hang(**kwargs):
+            await asyncio.sleep(60)
+        anthropic_client.client.messages.create = hang
+
+        await asyncio.wait_for(anthropic_client.warmup(timeout=0.01), 1)
+
+    @pytest.mark.asyncio
+    async def test_health_check_goes_through_rate_limiter(self, anthropic_client):
+        """Test that the health check consumes a rate limiter slot like other calls"""
+        tokens_before = anthropic_client._rate_limiter.tokens
+
+        assert await anthropic_client.health_check() is True
+
+        assert anthropic_client.client.messages.last_kwargs["max_tokens"] == 10
+        assert anthropic_client._rate_limiter.tokens < tokens_before
+
+    @pytest.mark.asyncio
+    async def test_generate_many_preserves_order(self, anthropic_client):
+        """Test that batched generation returns one response per prompt"""
+        responses = await anthropic_client.generate_many(["a", "b", "c"], temperature=0.5)
+
+        assert responses == ["cached answer"] * 3
+        assert anthropic_client.client.messages.calls == 3
+
+    @pytest.mark.asyncio
+    async def test_extract_json_uses_forced_tool_call(self, anthropic_client):
+        """Test that extraction returns the tool input without parsing text"""
+        tool_block = SimpleNamespace(type="tool_use", input={"revenue": 15.2})
+        anthropic_client.client.messages.content = [tool_block]
+
+        schema = {"type": "object", "properties": {"revenue": {"type": "number"}}}
+        data = await anthropic_client.extract_json("Revenue was $15.2B", schema)
+
+        assert data == {"revenue": 15.2}
+        kwargs = anthropic_client.client.messages.last_kwargs
+        assert kwargs["tool_choice"] == {"type": "tool", "name": "record_extraction"}
+        assert kwargs["tools"][0]["input_schema"] == schema
+
+
+class TestParseJsonObject:
+    """Test suite for parse_json_object"""
+
+    def test_object_surrounded_by_prose(self):
+        """Test extraction of an object with text and stray braces around it"""
+        text = 'Here you go: {"a": {"b": 1}} and a trailing } brace'
+        assert parse_json_object(text) == {"a": {"b": 1}}
+
+    def test_skips_invalid_leading_braces(self):
+        """Test that an invalid '{' before the real object is skipped"""
+        assert parse_json_object('{oops} {"ok": true}') == {"ok": True}
+
+    def test_bare_object(self):
+        """Test that a reply consisting of only the object is parsed directly"""
+        assert parse_json_object(' {"confidence": 0.85, "tags": ["a"]}\n') == {"confidence": 0.85, "tags": ["a"]}
+
+    def test_brace_delimited_text_with_two_objects(self):
+        """Test that text starting and ending with braces still yields the first object"""
+        assert parse_json_object('{"a": 1} then {"b": 2}') == {"a": 1}
+
+    def test_no_object(self):
+        """Test that text without an object returns None"""
+        assert parse_json_object("no json here") is None
+
+
+class TestMockLLMClient:
+    """Test suite for MockLLMClient"""
+
+    @pytest.mark.asyncio
+    async def test_health_check(self):
+        """Test that mock health check is awaitable and healthy"""
+        assert await MockLLMClient().health_check() is True
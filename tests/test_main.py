@@ -9,17 +9,25 @@ This test suite validates:
 
 import pytest
 from fastapi.testclient import TestClient
-from src.main import app
+import src.main
+from src.cache import TTLCache, content_hash
+from src.main import app, get_llm_client, read_report, process_earnings_report, OrjsonResponse
+
+
+@pytest.fixture(scope="session")
+def client():
+    """Test client shared by the session; startup and shutdown run once"""
+    # Start the app on the mock LLM client so tests never call the real API
+    with pytest.MonkeyPatch.context() as mp:
+        mp.delenv("ANTHROPIC_API_KEY", raising=False)
+        get_llm_client.cache_clear()
+        with TestClient(app) as test_client:
+            yield test_client
 
 
 class TestAPIEndpoints:
     """Test suite for FastAPI endpoints"""
 
-    @pytest.fixture
-    def client(self):
-        """Create a test client for the FastAPI app"""
-        return TestClient(app)
-
     def test_root_endpoint(self, client):
         """Test the root endpoint returns welcome message"""
         response = client.get("/")
@@ -43,6 +51,19 @@ class TestAPIEndpoints:
         assert "agents" in data
         assert isinstance(data["agents"], list)
 
+    def test_metrics_endpoint(self, client):
+        """Test the cache metrics endpoint"""
+        response = client.get("/metrics")
+        assert response.status_code == 200
+        data = response.json()
+        assert "workflow_results" in data["caches"]
+        assert "hits" in data["caches"]["workflow_results"]
+
+    def test_orjson_response_coerces_non_string_keys(self):
+        """Test that integer dict keys render as strings like JSONResponse"""
+        response = OrjsonResponse(content={1: "a", "b": 2})
+        assert response.body == b'{"1":"a","b":2}'
+
     def test_analyze_endpoint_requires_report_path(self, client):
         """Test that analyze endpoint requires report_path"""
         response = client.post("/analyze", json={})
@@ -59,3 +80,139 @@ class TestAPIEndpoints:
         # Should return either 200 (success) or 500 (if file not found/LLM error)
         # Both are acceptable for this test
         assert response.status_code in [200, 404, 500]
+
+    def test_analyze_batch_requires_report_paths(self, client):
+        """Test that batch endpoint rejects an empty path list"""
+        response = client.post("/analyze/batch", json={"report_paths": []})
+        assert response.status_code == 422
+
+    def test_analyze_batch_reports_per_item_errors(self, client):
+        """Test that a missing report fails only its own batch entry"""
+        request_data = {"report_paths": ["/nonexistent/report.txt"]}
+        response = client.post("/analyze/batch", json=request_data)
+        assert response.status_code == 200
+        data = response.json()
+        assert data["total"] == 1
+        assert data["results"][0]["status"] == "failed"
+
+    def test_analyze_stream_missing_report(self, client):
+        """Test that streaming endpoint returns 404 before streaming for missing files"""
+        request_data = {"report_path": "/nonexistent/report.txt"}
+        response = client.post("/analyze/stream", json=request_data)
+        assert response.status_code == 404
+
+
+class CountingWorkflow:
+    """Stand-in workflow that returns a fixed final state and counts invocations"""
+
+    def __init__(self, errors=None):
+        self.errors = errors or []
+        self.calls = 0
+
+    async def invoke(self, report_content, options=None):
+        self.calls += 1
+        return {
+            "report_content": report_content,
+            "report_content_lower": report_content.lower(),
+            "financial_metrics": {"revenue": {"value": 1.0}},
+            "segment_performance": {},
+            "sentiment_analysis": {"overall_sentiment": "positive"},
+            "forward_guidance": {},
+            "executive_summary": {"recommendation": "HOLD"},
+            "metadata": {},
+            "errors": list(self.errors),
+        }
+
+
+@pytest.fixture
+def report_file(tmp_path):
+    """A small report on disk"""
+    report = tmp_path / "report.txt"
+    report.write_text("Revenue: $1.0 billion", encoding="utf-8")
+    return str(report)
+
+
+@pytest.fixture
+def fresh_result_cache(monkeypatch):
+    """Run process_earnings_report against an empty, enabled result cache"""
+    cache = TTLCache()
+    monkeypatch.setattr(src.main, "result_cache", cache)
+    monkeypatch.setattr(src.main, "caching_enabled", True)
+    monkeypatch.setattr(src.main, "agents", {})
+    return cache
+
+
+class TestResultCache:
+    """Test suite for workflow result caching in process_earnings_report"""
+
+    @pytest.mark.asyncio
+    async def test_cached_entry_omits_report_text(self, monkeypatch, fresh_result_cache, report_file):
+        """Test that only the response sections of the final state are cached"""
+        monkeypatch.setattr(src.main, "workflow", CountingWorkflow())
+
+        await process_earnings_report(report_file, {})
+
+        cached = fresh_result_cache.get(content_hash("Revenue: $1.0 billion", {}))
+        assert "report_content" not in cached
+        assert "report_content_lower" not in cached
+        assert cached["executive_summary"] == {"recommendation": "HOLD"}
+
+    @pytest.mark.asyncio
+    async def test_repeat_report_reuses_workflow_result(self, monkeypatch, fresh_result_cache, report_file):
+        """Test that a repeated report skips the workflow but gets a fresh id and timestamp"""
+        counting_workflow = CountingWorkflow()
+        monkeypatch.setattr(src.main, "workflow", counting_workflow)
+
+        first = await process_earnings_report(report_file, {})
+        second = await process_earnings_report(report_file, {})
+
+        assert counting_workflow.calls == 1
+        assert fresh_result_cache.stats()["hits"] == 1
+        assert second["executive_summary"] == first["executive_summary"]
+        assert second["analysis_id"] != first["analysis_id"]
+        assert second["timestamp"] != first["timestamp"]
+
+    @pytest.mark.asyncio
+    async def test_failed_run_is_not_cached(self, monkeypatch, fresh_result_cache, report_file):
+        """Test that a run with agent errors is retried on the next request"""
+        counting_workflow = CountingWorkflow(errors=["Sentiment analysis failed"])
+        monkeypatch.setattr(src.main, "workflow", counting_workflow)
+
+        await process_earnings_report(report_file, {})
+        await process_earnings_report(report_file, {})
+
+        assert counting_workflow.calls == 2
+        assert len(fresh_result_cache) == 0
+
+
+class TestReadReport:
+    """Test suite for report file reading"""
+
+    @pytest.mark.asyncio
+    async def test_missing_report_raises(self, tmp_path):
+        """Test that a missing report raises FileNotFoundError"""
+        with pytest.raises(FileNotFoundError):
+            await read_report(str(tmp_path / "missing.txt"))
+
+    @pytest.mark.asyncio
+    async def test_unchanged_report_is_shared(self, tmp_path):
+        """Test that re-reading an unchanged file returns the cached content"""
+        report = tmp_path / "report.txt"
+        report.write_text("Revenue: $1.0 billion", encoding="utf-8")
+
+        first = await read_report(str(report))
+        second = await read_report(str(report))
+
+        assert first == "Revenue: $1.0 billion"
+        assert second is first
+
+    @pytest.mark.asyncio
+    async def test_modified_report_is_reread(self, tmp_path):
+        """Test that a modified file is read again"""
+        report = tmp_path / "report.txt"
+        report.write_text("Revenue: $1.0 billion", encoding="utf-8")
+        await read_report(str(report))
+
+        report.write_text("Revenue: $2.50 billion", encoding="utf-8")
+
+        assert await read_report(str(report)) == "Revenue: $2.50 billion"
@@ -0,0 +1,96 @@
+"""
+Tests for the LangGraph workflow orchestration.
+
+This test suite validates:
+- End-to-end graph execution with keyword-based agents
+- Parallel branch fan-out/fan-in
+- Error aggregation across branches
+"""
+
+import pytest
+from pathlib import Path
+from src.agents.coordinator import CoordinatorAgent
+from src.agents.data_extractor import DataExtractorAgent
+from src.agents.sentiment import SentimentAnalysisAgent
+from src.agents.summary import SummaryAgent
+from src.agents.base import AgentResult, AgentStatus
+from src.workflow.graph import WorkflowGraph
+
+
+def build_workflow(**overrides):
+    """Build a workflow with keyword-based agents, optionally overriding some"""
+    agents = {
+        "coordinator_agent": CoordinatorAgent(),
+        "data_extractor_agent": DataExtractorAgent(),
+        "sentiment_agent": SentimentAnalysisAgent(),
+        "summary_agent": SummaryAgent(),
+    }
+    agents.update(overrides)
+    return WorkflowGraph(**agents)
+
+
+@pytest.fixture
+def sample_report_content(sample_earnings_report):
+    """Return the text of the sample earnings report"""
+    return Path(sample_earnings_report).read_text(encoding="utf-8")
+
+
+class FailingAgent(SentimentAnalysisAgent):
+    """Agent that always reports a failed result"""
+
+    async def execute(self, input_data, context):
+        return AgentResult(
+            agent_name=self.name,
+            status=AgentStatus.FAILED,
+            data={},
+            errors=["boom"]
+        )
+
+
+class TestWorkflowGraph:
+    """Test suite for WorkflowGraph"""
+
+    @pytest.mark.asyncio
+    async def test_invoke_populates_all_sections(self, sample_report_content):
+        """Test that both parallel branches and the summary write their outputs"""
+        result = await build_workflow().invoke(sample_report_content)
+
+        assert result["errors"] == []
+        assert result["financial_metrics"]
+        assert result["sentiment_analysis"]
+        assert result["executive_summary"]["recommendation"] in {"BUY", "HOLD", "SELL"}
+
+    @pytest.mark.asyncio
+    async def test_invoke_merges_branch_errors(self):
+        """Test that errors from parallel branches are accumulated"""
+        workflow = build_workflow(
+            data_extractor_agent=FailingAgent(),
+            sentiment_agent=FailingAgent(),
+        )
+
+        result = await workflow.invoke("Revenue: $1.0 billion")
+
+        assert len(result["errors"]) == 2
+        assert result["executive_summary"]
+
+    @pytest.mark.asyncio
+    async def test_failed_branches_do_not_share_placeholders(self):
+        """Test that placeholder dicts left by failed branches are fresh per invocation"""
+        workflow = build_workflow(data_extractor_agent=FailingAgent())
+
+        first = await workflow.invoke("Revenue: $1.0 billion")
+        first["financial_metrics"]["revenue"] = "mutated"
+        second = await workflow.invoke("Revenue: $1.0 billion")
+
+        assert second["financial_metrics"] == {}
+
+    @pytest.mark.asyncio
+    async def test_astream_yields_each_stage(self, sample_report_content):
+        """Test that streaming emits one update per node, ending with the summary"""
+        events = [event async for event in build_workflow().astream(sample_report_content)]
+        stages = [event["stage"] for event in events]
+
+        assert stages[0] == "coordinator"
+        assert set(stages[1:3]) == {"data_extraction", "sentiment_analysis"}
+        assert stages[-1] == "summary_generation"
+        assert events[-1]["data"]["executive_summary"]